@@ -1,13 +1,16 @@
 import os
+import queue
+import threading
 import time
-import random
 from typing import List
 
+import numpy as np
 import redis
 
 REDIS_HOST = os.getenv("REDIS_HOST", "redis-stack")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 INTERVAL_SECONDS = int(os.getenv("INTERVAL_SECONDS", "5"))
+FINGERPRINT_CHANNEL = "system-fingerprints-ch"
 
 IMPORTANT_ENDPOINTS: List[str] = [
     "GET:/api/data",
@@ -33,69 +36,134 @@ STATUS_CODES: List[str] = [
 ]
 
 
-def cms_query(r: redis.Redis, key: str, items: List[str]) -> List[int]:
-    try:
-        res = r.execute_command("CMS.QUERY", key, *items)
-        return [int(x) for x in res]
-    except Exception:
-        return [0 for _ in items]
-
-
-def normalize(values: List[int]) -> List[float]:
-    total = float(sum(values))
+# The endpoint/status lists are fixed at startup, so the sketch queries and
+# the fingerprint format string can be built once instead of per tick.
+_CMS_EP_CMD = ("CMS.QUERY", "endpoint-frequency", *IMPORTANT_ENDPOINTS)
+_CMS_ST_CMD = ("CMS.QUERY", "status-codes", *STATUS_CODES)
+_FMT = (
+    "[" + ",".join(["{:.6f}"] * (len(IMPORTANT_ENDPOINTS) + len(STATUS_CODES))) + "]"
+)
+
+# Single generator for all simulated jitter; one vectorized draw replaces
+# the per-element random.* calls.
+rng = np.random.default_rng()
+
+
+def cms_query_all(r: redis.Redis) -> tuple:
+    """Fetch both sketches in a single pipelined round-trip."""
+    pipe = r.pipeline(transaction=False)
+    pipe.execute_command(*_CMS_EP_CMD)
+    pipe.execute_command(*_CMS_ST_CMD)
+    endpoint_res, status_res = pipe.execute(raise_on_error=False)
+    if isinstance(endpoint_res, Exception):
+        endpoint_counts = [0 for _ in IMPORTANT_ENDPOINTS]
+    else:
+        endpoint_counts = [int(x) for x in endpoint_res]
+    if isinstance(status_res, Exception):
+        status_counts = [0 for _ in STATUS_CODES]
+    else:
+        status_counts = [int(x) for x in status_res]
+    return endpoint_counts, status_counts
+
+
+def normalize(values) -> np.ndarray:
+    a = np.asarray(values, dtype=np.float64)
+    total = a.sum()
     if total == 0.0:
-        return [0.0 for _ in values]
-    return [v / total for v in values]
+        return np.zeros_like(a)
+    return a / total
 
 
-def write_stream(r: redis.Redis, vec: List[float]) -> None:
-    data = "[" + ",".join([str(round(x, 6)) for x in vec]) + "]"
-    r.xadd("system-fingerprints", {"data": data})
+# Fingerprints queued for the background flusher; bounded so a dead Redis
+# doesn't grow memory (dropping fingerprints on overflow is cheap).
+write_queue: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=256)
+FLUSH_BATCH = 32
 
 
-def reset_sketches(r: redis.Redis) -> None:
+def write_stream(r: redis.Redis, vec: np.ndarray) -> None:
+    # Fire-and-forget: hand the vector to the flusher thread so tick() never
+    # waits on the XADD acknowledgement.
     try:
-        r.delete("endpoint-frequency")
-        r.execute_command("CMS.INITBYDIM", "endpoint-frequency", 100000, 10)
-    except Exception:
+        write_queue.put_nowait(vec)
+    except queue.Full:
         pass
+
+
+def stream_flusher(r: redis.Redis) -> None:
+    while True:
+        vecs = [write_queue.get()]
+        while len(vecs) < FLUSH_BATCH:
+            try:
+                vecs.append(write_queue.get_nowait())
+            except queue.Empty:
+                break
+        pipe = r.pipeline(transaction=False)
+        for vec in vecs:
+            # Precompiled fixed-width format; the payload must stay a JSON
+            # array because the dashboard BFF JSON.parses it.
+            data = _FMT.format(*vec)
+            # XADD keeps the durable stream for training/replay; the publish
+            # pushes the fingerprint to live consumers without XREAD polling.
+            pipe.xadd("system-fingerprints", {"data": data})
+            pipe.publish(FINGERPRINT_CHANNEL, data)
+        try:
+            pipe.execute(raise_on_error=False)
+        except Exception as e:
+            print("Stream flush failed:", e)
+
+
+def reset_sketches(r: redis.Redis) -> None:
+    # Batch both DEL + CMS.INITBYDIM pairs into one round-trip; replies are
+    # ignored so per-command errors don't matter. (CLIENT REPLY OFF/SKIP
+    # would also suppress the replies server-side, but redis-py matches
+    # replies to queued commands one-to-one, so suppressing them desyncs
+    # the parser; the single pipelined RTT is the practical equivalent.)
+    pipe = r.pipeline(transaction=False)
+    pipe.delete("endpoint-frequency")
+    pipe.execute_command("CMS.INITBYDIM", "endpoint-frequency", 100000, 10)
+    pipe.delete("status-codes")
+    pipe.execute_command("CMS.INITBYDIM", "status-codes", 100000, 10)
     try:
-        r.delete("status-codes")
-        r.execute_command("CMS.INITBYDIM", "status-codes", 100000, 10)
+        pipe.execute(raise_on_error=False)
     except Exception:
         pass
 
 
 def tick(r: redis.Redis) -> None:
-    endpoint_counts = cms_query(r, "endpoint-frequency", IMPORTANT_ENDPOINTS)
-    status_counts = cms_query(r, "status-codes", STATUS_CODES)
+    endpoint_counts, status_counts = cms_query_all(r)
+    endpoint_counts = np.asarray(endpoint_counts, dtype=np.int64)
+    status_counts = np.asarray(status_counts, dtype=np.int64)
 
     # Add some realistic variation to simulate real-world fluctuations
     # Occasionally inject anomalous patterns for AI detection
-    if random.random() < 0.15:  # 15% chance of anomalous behavior
+    if rng.random() < 0.15:  # 15% chance of anomalous behavior
         # Simulate unusual patterns: spike in errors, unusual endpoint access, etc.
-        if random.random() < 0.5:
+        if rng.random() < 0.5:
             # Spike in error rates
-            status_counts = [
-                c + random.randint(5, 15) if i >= 2 else c
-                for i, c in enumerate(status_counts)
-            ]
+            status_counts[2:] += rng.integers(5, 16, size=status_counts.size - 2)
         else:
             # Unusual endpoint access pattern
-            unusual_idx = random.randint(0, len(endpoint_counts) - 1)
-            endpoint_counts[unusual_idx] += random.randint(10, 30)
-
-    # Add small natural variation (1-5% fluctuation)
-    endpoint_counts = [max(0, c + random.randint(-1, 2)) for c in endpoint_counts]
-    status_counts = [max(0, c + random.randint(-1, 2)) for c in status_counts]
-
-    vec = normalize(endpoint_counts) + normalize(status_counts)
+            unusual_idx = int(rng.integers(endpoint_counts.size))
+            endpoint_counts[unusual_idx] += int(rng.integers(10, 31))
+
+    # Add small natural variation (1-5% fluctuation), one vectorized draw per list
+    endpoint_counts = np.maximum(
+        0, endpoint_counts + rng.integers(-1, 3, size=endpoint_counts.size)
+    )
+    status_counts = np.maximum(
+        0, status_counts + rng.integers(-1, 3, size=status_counts.size)
+    )
+
+    vec = np.concatenate([normalize(endpoint_counts), normalize(status_counts)])
     write_stream(r, vec)
     # Removed reset_sketches(r) to allow data accumulation
 
 
 def main():
-    r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
+    # Bytes mode: replies here are counts and ignored acks, so per-reply
+    # UTF-8 decoding would be pure overhead.
+    r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
+    threading.Thread(target=stream_flusher, args=(r,), daemon=True).start()
     while True:
         try:
             tick(r)
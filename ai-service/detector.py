@@ -1,4 +1,5 @@
 import os
+import pickle
 import time
 from typing import List
 
@@ -6,86 +7,279 @@ import numpy as np
 import redis
 from sklearn.ensemble import IsolationForest
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to sklearn predict
+    njit = None
+
+try:
+    import onnxruntime as ort
+    from skl2onnx import to_onnx
+except ImportError:  # ONNX inference is optional; fall back to numba/sklearn
+    ort = None
+
 REDIS_HOST = os.getenv("REDIS_HOST", "redis-stack")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 
 STREAM_KEY = "system-fingerprints"
+FINGERPRINT_CHANNEL = "system-fingerprints-ch"
 PUBSUB_CHANNEL = "alerts"
+# Versioned so a schema change invalidates stale persisted models
+MODEL_KEY = "ifmodel:v1"
+
 
+READ_BATCH = 32
 
-def read_stream_blocking(r: redis.Redis, last_id: str):
-    resp = r.xread({STREAM_KEY: last_id}, count=1, block=10_000)
+
+def read_stream_blocking(r: redis.Redis, last_id: str, count: int = READ_BATCH):
+    """Read up to `count` entries in one XREAD; returns (last_id, fields list)."""
+    resp = r.xread({STREAM_KEY: last_id}, count=count, block=10_000)
     if not resp:
-        return last_id, None
+        return last_id, []
     _, entries = resp[0]
-    entry_id, fields = entries[0]
-    return entry_id, fields
+    return entries[-1][0], [fields for _, fields in entries]
+
+
+# 7 endpoints + 11 status codes = 18 features
+EXPECTED_FEATURES = 18
 
 
-def parse_vector(fields) -> List[float]:
-    raw = fields.get("data")
+def parse_vector(fields, out=None):
+    """Parse a fingerprint payload; writes into `out` when it fits."""
+    raw = fields.get("data") or fields.get(b"data")
     if not raw:
-        return []
+        return None
     try:
+        # Bytes-mode client: only this one field needs decoding
+        if isinstance(raw, bytes):
+            raw = raw.decode()
         raw = raw.strip()
         if raw.startswith("[") and raw.endswith("]"):
             raw = raw[1:-1]
-        vec = [float(x) for x in raw.split(",") if x.strip()]
-        # Ensure consistent vector length (7 endpoints + 11 status codes = 18 features)
-        expected_length = 18
-        if len(vec) != expected_length:
-            print(
-                f"Warning: Vector length {len(vec)}, expected {expected_length}. Padding/truncating."
-            )
-            if len(vec) < expected_length:
-                vec.extend([0.0] * (expected_length - len(vec)))
-            else:
-                vec = vec[:expected_length]
-        return vec
+        # NumPy parses the comma-separated floats in C, skipping the
+        # per-element float() calls and the intermediate Python list.
+        parts = raw.split(",")
+        if out is not None and len(parts) == out.shape[0]:
+            out[:] = parts
+            return out
+        vec = np.array(parts, dtype=np.float64)
     except Exception as e:
         print(f"Error parsing vector: {e}")
-        return []
+        return None
+    if vec.shape[0] != EXPECTED_FEATURES:
+        print(
+            f"Warning: Vector length {vec.shape[0]}, expected {EXPECTED_FEATURES}. Padding/truncating."
+        )
+        if vec.shape[0] < EXPECTED_FEATURES:
+            vec = np.pad(vec, (0, EXPECTED_FEATURES - vec.shape[0]))
+        else:
+            vec = vec[:EXPECTED_FEATURES]
+    return vec
 
 
-def main():
-    r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
+def extract_forest_arrays(model: IsolationForest):
+    """Flatten the fitted trees into dense arrays for the compiled scorer."""
+    n_trees = len(model.estimators_)
+    max_nodes = max(est.tree_.node_count for est in model.estimators_)
+    features = np.zeros((n_trees, max_nodes), dtype=np.int64)
+    thresholds = np.zeros((n_trees, max_nodes), dtype=np.float64)
+    left = np.full((n_trees, max_nodes), -1, dtype=np.int64)
+    right = np.full((n_trees, max_nodes), -1, dtype=np.int64)
+    node_samples = np.zeros((n_trees, max_nodes), dtype=np.float64)
+    for i, est in enumerate(model.estimators_):
+        tree = est.tree_
+        n = tree.node_count
+        features[i, :n] = tree.feature
+        thresholds[i, :n] = tree.threshold
+        left[i, :n] = tree.children_left
+        right[i, :n] = tree.children_right
+        node_samples[i, :n] = tree.n_node_samples
+    return features, thresholds, left, right, node_samples
+
+
+def _average_path_length(n: float) -> float:
+    # Same formula sklearn uses to normalize isolation depths.
+    if n <= 1.0:
+        return 0.0
+    if n == 2.0:
+        return 1.0
+    return 2.0 * (np.log(n - 1.0) + np.euler_gamma) - 2.0 * (n - 1.0) / n
+
+
+if njit is not None:
+
+    # The explicit signature compiles at import time and cache=True writes
+    # the compiled artifact to disk, so restarted containers skip the
+    # multi-second JIT warmup entirely (the image build pre-warms the cache).
+    @njit(
+        "f8(f8[:], i8[:,:], f8[:,:], i8[:,:], i8[:,:], f8[:,:], f8)",
+        cache=True,
+    )
+    def _forest_score(vec, features, thresholds, left, right, node_samples, c_norm):
+        """Anomaly score matching IsolationForest.score_samples for one row."""
+        depth_sum = 0.0
+        for t in range(features.shape[0]):
+            node = 0
+            depth = 0.0
+            while left[t, node] != -1:
+                if vec[features[t, node]] <= thresholds[t, node]:
+                    node = left[t, node]
+                else:
+                    node = right[t, node]
+                depth += 1.0
+            leaf_n = node_samples[t, node]
+            if leaf_n > 2.0:
+                depth += 2.0 * (np.log(leaf_n - 1.0) + 0.5772156649015329) - 2.0 * (
+                    leaf_n - 1.0
+                ) / leaf_n
+            elif leaf_n == 2.0:
+                depth += 1.0
+            depth_sum += depth
+        return -(2.0 ** (-depth_sum / c_norm))
+
+
+def build_predictor(model: IsolationForest):
+    """Return vec -> 1/-1, using the JIT tree traversal when available.
+
+    The compiled path skips sklearn's per-call validation and batch
+    machinery, which dominates the cost of scoring a single row.
+    """
+    offset = float(model.offset_)
+
+    if ort is not None:
+        try:
+            # Convert once to ONNX and serve with onnxruntime's C++ tree
+            # ensemble kernel (FP32, vectorized); preferred over both the
+            # numba traversal and sklearn's Python dispatch.
+            onx = to_onnx(model, np.zeros((1, model.n_features_in_), dtype=np.float32))
+            sess = ort.InferenceSession(
+                onx.SerializeToString(), providers=["CPUExecutionProvider"]
+            )
+            input_name = sess.get_inputs()[0].name
+            X_row32 = np.empty((1, model.n_features_in_), dtype=np.float32)
+
+            def predict_onnx(vec: np.ndarray) -> int:
+                X_row32[0] = vec
+                return int(sess.run(None, {input_name: X_row32})[0][0])
+
+            # Warmup doubles as a contract check: the converter emits the
+            # -1/1 label as the first output (scores second); if that ever
+            # changes, bail out here into the fallback paths below.
+            warm = predict_onnx(np.zeros(model.n_features_in_, dtype=np.float64))
+            if warm not in (-1, 1):
+                raise ValueError(f"first ONNX output is not the -1/1 label: {warm}")
+            print("Using ONNX Runtime for inference.")
+            return predict_onnx
+        except Exception as e:
+            print(f"ONNX conversion failed; falling back: {e}")
+
+    if njit is None:
+        # Reuse a single 1xd row so each prediction skips the array wrap.
+        # The trees demand float32 (tree.apply runs with check_input=False),
+        # so assigning into this row performs the exact downcast that
+        # predict()'s validation pass would have done.
+        X_row = np.empty((1, model.n_features_in_), dtype=np.float32)
 
+        def predict_sklearn(vec: np.ndarray) -> int:
+            X_row[0] = vec
+            score = -model._compute_chunked_score_samples(X_row)[0]
+            return -1 if score - offset < 0 else 1
+
+        # Same warmup as the other branches: fail loudly at startup, not on
+        # the first stream entry.
+        predict_sklearn(np.zeros(model.n_features_in_, dtype=np.float64))
+        return predict_sklearn
+
+    features, thresholds, left, right, node_samples = extract_forest_arrays(model)
+    c_norm = len(model.estimators_) * _average_path_length(float(model.max_samples_))
+
+    def predict_one(vec: np.ndarray) -> int:
+        score = _forest_score(
+            vec, features, thresholds, left, right, node_samples, c_norm
+        )
+        return -1 if score - offset < 0 else 1
+
+    # Trigger compilation now so the first stream entry isn't charged for it
+    predict_one(np.zeros(model.n_features_in_, dtype=np.float64))
+    return predict_one
+
+
+def load_saved_model(store: redis.Redis):
+    """Load a previously persisted model so restarts skip the warmup."""
+    try:
+        blob = store.get(MODEL_KEY)
+        if blob:
+            model = pickle.loads(blob)
+            if model.n_features_in_ == EXPECTED_FEATURES:
+                print("Loaded persisted model; skipping training warmup.")
+                return model
+            print("Persisted model has stale feature count; retraining.")
+    except Exception as e:
+        print(f"Could not load persisted model: {e}")
+    return None
+
+
+def save_model(store: redis.Redis, model: IsolationForest) -> None:
+    try:
+        store.set(MODEL_KEY, pickle.dumps(model))
+        print("Persisted trained model for future restarts.")
+    except Exception as e:
+        print(f"Could not persist model: {e}")
+
+
+def train_model(r: redis.Redis) -> IsolationForest:
     # Training phase: collect ~60 fingerprints (~5 minutes at 5s interval)
-    training_vectors: List[List[float]] = []
+    training_vectors: List[np.ndarray] = []
     last_id = "$"
     start = time.time()
     training_target = int(os.getenv("TRAINING_TARGET", "3"))
 
     print("AI service: collecting training data...")
     while len(training_vectors) < training_target and time.time() - start < 600:
-        last_id, fields = read_stream_blocking(r, last_id)
-        if not fields:
-            continue
-        vec = parse_vector(fields)
-        if vec:
-            training_vectors.append(vec)
-            print(f"Collected {len(training_vectors)}/{training_target}")
+        last_id, batch = read_stream_blocking(r, last_id)
+        for fields in batch:
+            vec = parse_vector(fields)
+            if vec is not None:
+                training_vectors.append(vec)
+                print(f"Collected {len(training_vectors)}/{training_target}")
 
     if not training_vectors:
-        print("No training data collected; exiting.")
-        return
+        return None
 
     X_train = np.array(training_vectors)
     model = IsolationForest(contamination="auto", random_state=42)
     model.fit(X_train)
+    return model
+
+
+def main():
+    # Bytes mode: skips per-field UTF-8 decoding of every reply and lets the
+    # same connection hold the pickled model blob.
+    r = redis.Redis(host=REDIS_HOST, port=REDIS_PORT)
+
+    model = load_saved_model(r)
+    if model is None:
+        model = train_model(r)
+        if model is None:
+            print("No training data collected; exiting.")
+            return
+        save_model(r, model)
+
+    predict_one = build_predictor(model)
     print("Model training complete; entering detection mode.")
 
-    # Detection loop
-    while True:
-        last_id, fields = read_stream_blocking(r, last_id)
-        if not fields:
-            continue
-        vec = parse_vector(fields)
-        if not vec:
+    # Detection loop: fingerprints are pushed over pub/sub, so there is no
+    # XREAD block-poll cycle on the hot path (the stream stays available for
+    # training replay above).
+    pubsub = r.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(FINGERPRINT_CHANNEL)
+    scratch = np.empty(EXPECTED_FEATURES, dtype=np.float64)
+    for message in pubsub.listen():
+        vec = parse_vector({"data": message["data"]}, out=scratch)
+        if vec is None:
             continue
-        X_new = np.array([vec])
-        pred = model.predict(X_new)  # 1 normal, -1 anomaly
-        if pred[0] == -1:
+        pred = predict_one(vec)  # 1 / -1
+        if pred == -1:
             msg = "Anomaly detected: Outlier fingerprint observed."
             r.publish(PUBSUB_CHANNEL, msg)
             print(msg)
@@ -24,12 +24,45 @@ Usage:
 """
 
 import json
+import queue
+import threading
 import time
 import requests
 from typing import Dict, List, Optional, Union, Any
-from datetime import datetime
 import logging
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+try:
+    import httpx
+except ImportError:  # httpx is optional; only needed for AsyncAnomalyClient
+    httpx = None
+
+
+def _dump_json(data: Dict) -> bytes:
+    return orjson.dumps(data) if orjson is not None else json.dumps(data).encode()
+
+
+_last_second = 0
+_last_prefix = ""
+
+
+def _iso_now() -> str:
+    """ISO-8601 UTC timestamp without datetime construction overhead
+
+    The second-resolution prefix is cached so repeated calls within the
+    same second only format the microsecond suffix.
+    """
+    global _last_second, _last_prefix
+    seconds, ns = divmod(time.time_ns(), 1_000_000_000)
+    if seconds != _last_second:
+        _last_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _last_second = seconds
+    return f"{_last_prefix}.{ns // 1000:06d}Z"
+
 
 class AnomalyClientError(Exception):
     """Custom exception for anomaly client errors"""
@@ -54,6 +87,28 @@ class AnomalyClient:
         self.timeout = timeout
         self.session = requests.Session()
 
+        # Size the connection pool for high-RPS middleware use; the default
+        # adapter keeps only 10 pooled connections per host.
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=64, pool_maxsize=64, max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Precompute the fixed endpoint URLs so hot-path calls skip the
+        # per-request string building in _make_request.
+        self._urls = {
+            endpoint: f"{self.base_url}/{endpoint.lstrip('/')}"
+            for endpoint in (
+                "/health",
+                "/api/metrics",
+                "/api/business-metrics",
+                "/api/logs",
+                "/api/batch",
+                "/config",
+            )
+        }
+
         if api_key:
             self.session.headers.update({"Authorization": f"Bearer {api_key}"})
 
@@ -71,11 +126,15 @@ class AnomalyClient:
         self, method: str, endpoint: str, data: Optional[Dict] = None
     ) -> Dict:
         """Make HTTP request to the anomaly detector service"""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        url = self._urls.get(endpoint) or f"{self.base_url}/{endpoint.lstrip('/')}"
+
+        # Serialize once with orjson (bytes out, no extra encode step)
+        # instead of routing through requests' stdlib json= path.
+        body = _dump_json(data) if data is not None else None
 
         try:
             response = self.session.request(
-                method=method, url=url, json=data, timeout=self.timeout
+                method=method, url=url, data=body, timeout=self.timeout
             )
 
             if response.status_code >= 400:
@@ -118,7 +177,7 @@ class AnomalyClient:
             })
         """
         if "timestamp" not in metric_data:
-            metric_data["timestamp"] = datetime.utcnow().isoformat() + "Z"
+            metric_data["timestamp"] = _iso_now()
 
         return self._make_request("POST", "/api/metrics", metric_data)
 
@@ -149,7 +208,7 @@ class AnomalyClient:
         data = {
             "metric_name": metric_name,
             "value": value,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _iso_now(),
         }
 
         if expected_range:
@@ -184,7 +243,7 @@ class AnomalyClient:
             "log_level": log_level.upper(),
             "message": message,
             "service": service,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": _iso_now(),
         }
 
         if context:
@@ -222,12 +281,154 @@ class AnomalyClient:
         return self._make_request("GET", "/config")
 
 
+class AsyncAnomalyClient:
+    """Async client for AI Anomaly Detector (httpx, HTTP/2)
+
+    Multiplexes concurrent metric calls over a single connection, which
+    suits async frameworks where per-request synchronous POSTs would
+    serialize the application to the detector's round-trip time.
+    Requires the optional `httpx[http2]` dependency.
+
+    Usage:
+        client = AsyncAnomalyClient('http://anomaly-detector:4000')
+        await client.send_metric({...})
+        await client.aclose()
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout: int = 30):
+        if httpx is None:
+            raise AnomalyClientError(
+                "httpx is required for AsyncAnomalyClient "
+                "(pip install 'httpx[http2]')"
+            )
+
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "AnomalyClient-Python/1.0",
+        }
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=True,
+            headers=headers,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+        )
+
+    async def _make_request(
+        self, method: str, endpoint: str, data: Optional[Dict] = None
+    ) -> Dict:
+        """Make an async HTTP request to the anomaly detector service"""
+        body = _dump_json(data) if data is not None else None
+
+        try:
+            response = await self.client.request(method, endpoint, content=body)
+        except httpx.HTTPError as e:
+            raise AnomalyClientError(f"Network error: {str(e)}")
+
+        if response.status_code >= 400:
+            try:
+                error_data = response.json()
+                error_msg = error_data.get("error", f"HTTP {response.status_code}")
+            except Exception:
+                error_msg = f"HTTP {response.status_code}: {response.text}"
+
+            raise AnomalyClientError(f"Request failed: {error_msg}")
+
+        return response.json()
+
+    async def health_check(self) -> Dict:
+        """Check if the anomaly detector service is healthy"""
+        return await self._make_request("GET", "/health")
+
+    async def send_metric(self, metric_data: Dict) -> Dict:
+        """Send application metrics (see AnomalyClient.send_metric)"""
+        if "timestamp" not in metric_data:
+            metric_data["timestamp"] = _iso_now()
+
+        return await self._make_request("POST", "/api/metrics", metric_data)
+
+    async def send_business_metric(
+        self,
+        metric_name: str,
+        value: Union[int, float],
+        expected_range: Optional[List[float]] = None,
+        metadata: Optional[Dict] = None,
+    ) -> Dict:
+        """Send business metrics (see AnomalyClient.send_business_metric)"""
+        data = {
+            "metric_name": metric_name,
+            "value": value,
+            "timestamp": _iso_now(),
+        }
+
+        if expected_range:
+            data["expected_range"] = expected_range
+
+        if metadata:
+            data["metadata"] = metadata
+
+        return await self._make_request("POST", "/api/business-metrics", data)
+
+    async def send_log(
+        self, log_level: str, message: str, service: str, context: Optional[Dict] = None
+    ) -> Dict:
+        """Send log-based metrics (see AnomalyClient.send_log)"""
+        data = {
+            "log_level": log_level.upper(),
+            "message": message,
+            "service": service,
+            "timestamp": _iso_now(),
+        }
+
+        if context:
+            data["context"] = context
+
+        return await self._make_request("POST", "/api/logs", data)
+
+    async def send_batch(self, metrics: List[Dict]) -> Dict:
+        """Send multiple metrics in a single request"""
+        return await self._make_request("POST", "/api/batch", {"metrics": metrics})
+
+    async def get_config(self) -> Dict:
+        """Get current anomaly detector configuration"""
+        return await self._make_request("GET", "/config")
+
+    async def aclose(self):
+        """Close the underlying connection pool"""
+        await self.client.aclose()
+
+
 class AnomalyMiddleware:
-    """Middleware helper for automatic metric collection"""
+    """Middleware helper for automatic metric collection
 
-    def __init__(self, client: AnomalyClient, service_name: str):
+    Tracked requests are queued and shipped in the background via the
+    batch API, so track_request never blocks the application's request
+    path on an outbound HTTP call.
+    """
+
+    MAX_BATCH = 100
+    FLUSH_INTERVAL = 0.05  # seconds between background flushes
+
+    def __init__(
+        self,
+        client: AnomalyClient,
+        service_name: str,
+        max_queue: int = 1000,
+        auto_flush: bool = True,
+    ):
         self.client = client
         self.service_name = service_name
+        self.queue: "queue.Queue[Dict]" = queue.Queue(maxsize=max_queue)
+
+        if auto_flush:
+            worker = threading.Thread(target=self._flush_loop, daemon=True)
+            worker.start()
 
     def track_request(
         self,
@@ -237,24 +438,54 @@ class AnomalyMiddleware:
         response_time: float,
         extra_metrics: Optional[Dict] = None,
     ):
-        """Track a request automatically"""
+        """Track a request automatically (non-blocking)"""
         metrics = {"response_time": response_time, "status_code": status_code}
 
         if extra_metrics:
             metrics.update(extra_metrics)
 
+        item = {
+            "type": "application",
+            "service": self.service_name,
+            "endpoint": f"{method}:{path}",
+            "metrics": metrics,
+        }
+
         try:
-            self.client.send_metric(
-                {
-                    "service": self.service_name,
-                    "endpoint": f"{method}:{path}",
-                    "metrics": metrics,
-                }
-            )
+            self.queue.put_nowait(item)
+        except queue.Full:
+            # Don't let anomaly detection break the application
+            logging.warning("Anomaly metric queue full; dropping metric")
+
+    def flush(self):
+        """Send any queued metrics now (useful at shutdown)"""
+        items = self._drain()
+        if items:
+            self._send_batch(items)
+
+    def _drain(self) -> List[Dict]:
+        items: List[Dict] = []
+        while len(items) < self.MAX_BATCH:
+            try:
+                items.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _send_batch(self, items: List[Dict]):
+        try:
+            self.client.send_batch(items)
         except AnomalyClientError as e:
             # Don't let anomaly detection break the application
             logging.warning(f"Failed to send metrics: {e}")
 
+    def _flush_loop(self):
+        while True:
+            first = self.queue.get()
+            items = [first] + self._drain()
+            self._send_batch(items)
+            time.sleep(self.FLUSH_INTERVAL)
+
 
 # Context manager for automatic timing
 class RequestTimer:
@@ -9,14 +9,27 @@ import argparse
 import os
 
 
-def run_command(cmd, check=True):
-    """Run a command and return the result"""
+def run_command(cmd, check=True, capture=False):
+    """Run a command, streaming output line by line as it arrives"""
     print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, check=check, capture_output=True, text=True)
-    print(result.stdout)
-    if result.stderr:
-        print(result.stderr, file=sys.stderr)
-    return result
+    captured = [] if capture else None
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+    )
+    for line in proc.stdout:
+        sys.stdout.write(line)
+        if capture:
+            captured.append(line)
+    returncode = proc.wait()
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return subprocess.CompletedProcess(
+        cmd, returncode, stdout="".join(captured) if capture else None
+    )
 
 
 def install_dependencies():
@@ -25,65 +38,48 @@ def install_dependencies():
     run_command([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
 
 
-def run_unit_tests():
+def pytest_command(jobs="auto"):
+    """Base pytest command with xdist workers (loadscope spreads classes
+    across workers; with one test file, per-file distribution would pin
+    everything to a single worker)"""
+    return [
+        sys.executable,
+        "-m",
+        "pytest",
+        "test_anomaly_client.py",
+        "-v",
+        "--tb=short",
+        "-n",
+        str(jobs),
+        "--dist=loadscope",
+    ]
+
+
+def run_unit_tests(jobs="auto"):
     """Run unit tests only"""
     print("🧪 Running unit tests...")
-    run_command(
-        [
-            sys.executable,
-            "-m",
-            "pytest",
-            "test_anomaly_client.py",
-            "-v",
-            "--tb=short",
-            "-m",
-            "not integration",
-        ]
-    )
+    run_command(pytest_command(jobs) + ["-m", "not integration"])
 
 
-def run_integration_tests():
+def run_integration_tests(jobs="auto"):
     """Run integration tests (requires running data collector)"""
     print("🔗 Running integration tests...")
-    run_command(
-        [
-            sys.executable,
-            "-m",
-            "pytest",
-            "test_anomaly_client.py",
-            "-v",
-            "--tb=short",
-            "-m",
-            "integration",
-        ]
-    )
+    run_command(pytest_command(jobs) + ["-m", "integration"])
 
 
-def run_all_tests():
+def run_all_tests(jobs="auto"):
     """Run all tests"""
     print("🚀 Running all tests...")
-    run_command(
-        [sys.executable, "-m", "pytest", "test_anomaly_client.py", "-v", "--tb=short"]
-    )
+    run_command(pytest_command(jobs))
 
 
-def run_coverage():
-    """Run tests with coverage report"""
+def run_coverage(jobs="auto"):
+    """Run tests with coverage report (pytest-cov merges xdist workers)"""
     print("📊 Running tests with coverage...")
     run_command(
-        [
-            sys.executable,
-            "-m",
-            "coverage",
-            "run",
-            "-m",
-            "pytest",
-            "test_anomaly_client.py",
-            "-v",
-        ]
+        pytest_command(jobs)
+        + ["--cov=anomaly_client", "--cov-report=term", "--cov-report=html"]
     )
-    run_command([sys.executable, "-m", "coverage", "report"])
-    run_command([sys.executable, "-m", "coverage", "html"])
     print("📈 Coverage report generated in htmlcov/")
 
 
@@ -123,6 +119,11 @@ def main():
     )
     parser.add_argument("--example", action="store_true", help="Test example usage")
     parser.add_argument("--all", action="store_true", help="Run all tests (default)")
+    parser.add_argument(
+        "--jobs",
+        default="auto",
+        help="Number of pytest-xdist workers (default: auto)",
+    )
 
     args = parser.parse_args()
 
@@ -133,17 +134,17 @@ def main():
         install_dependencies()
 
     if args.unit:
-        run_unit_tests()
+        run_unit_tests(args.jobs)
     elif args.integration:
-        run_integration_tests()
+        run_integration_tests(args.jobs)
     elif args.coverage:
-        run_coverage()
+        run_coverage(args.jobs)
     elif args.example:
         test_example_usage()
     elif args.all or not any(
         [args.unit, args.integration, args.coverage, args.example]
     ):
-        run_all_tests()
+        run_all_tests(args.jobs)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,7 @@ Comprehensive test suite for AI Anomaly Detector Python Client SDK
 
 import pytest
 import json
+import requests
 import requests_mock
 from datetime import datetime
 from unittest.mock import Mock, patch
@@ -18,6 +19,14 @@ from anomaly_client import (
 )
 
 
+# Mock(spec=...) introspects the whole AnomalyClient surface on every
+# construction; one module-scoped instance amortizes that and the per-class
+# autouse fixtures below reset its state between tests.
+@pytest.fixture(scope="module")
+def mock_client():
+    return Mock(spec=AnomalyClient)
+
+
 class TestAnomalyClient:
     """Test cases for AnomalyClient class"""
 
@@ -27,6 +36,15 @@ class TestAnomalyClient:
         self.api_key = "test-api-key"
         self.client = AnomalyClient(self.base_url, self.api_key)
 
+    @pytest.fixture
+    def m(self):
+        """Replaces the per-method @requests_mock.Mocker() decorator. Purely
+        a boilerplate cleanup: being function-scoped, it still installs and
+        removes the transport adapter once per test, same as the decorator
+        did, but each test gets a fresh Mocker without the extra argument."""
+        with requests_mock.Mocker() as mock:
+            yield mock
+
     def test_client_initialization(self):
         """Test client initialization"""
         # Test with API key
@@ -45,7 +63,6 @@ class TestAnomalyClient:
         client = AnomalyClient("http://test.com/")
         assert client.base_url == "http://test.com"
 
-    @requests_mock.Mocker()
     def test_health_check_success(self, m):
         """Test successful health check"""
         expected_response = {"status": "healthy", "redis_connected": True}
@@ -54,7 +71,6 @@ class TestAnomalyClient:
         result = self.client.health_check()
         assert result == expected_response
 
-    @requests_mock.Mocker()
     def test_health_check_failure(self, m):
         """Test failed health check"""
         m.get(f"{self.base_url}/health", status_code=500, json={"error": "Redis connection failed"})
@@ -64,7 +80,6 @@ class TestAnomalyClient:
         
         assert "Redis connection failed" in str(exc_info.value)
 
-    @requests_mock.Mocker()
     def test_send_metric_success(self, m):
         """Test successful metric sending"""
         metric_data = {
@@ -88,7 +103,6 @@ class TestAnomalyClient:
         assert request_data["endpoint"] == "GET:/api/users"
         assert "timestamp" in request_data  # Should auto-add timestamp
 
-    @requests_mock.Mocker()
     def test_send_business_metric_success(self, m):
         """Test successful business metric sending"""
         expected_response = {"status": "success", "metric_id": "67890"}
@@ -111,7 +125,6 @@ class TestAnomalyClient:
         assert request_data["metadata"]["currency"] == "USD"
         assert "timestamp" in request_data
 
-    @requests_mock.Mocker()
     def test_send_log_success(self, m):
         """Test successful log sending"""
         expected_response = {"status": "success", "log_id": "log123"}
@@ -134,7 +147,6 @@ class TestAnomalyClient:
         assert request_data["context"]["user_id"] == "12345"
         assert "timestamp" in request_data
 
-    @requests_mock.Mocker()
     def test_send_batch_success(self, m):
         """Test successful batch sending"""
         batch_data = [
@@ -161,7 +173,6 @@ class TestAnomalyClient:
         request_data = json.loads(request.text)
         assert len(request_data["metrics"]) == 2
 
-    @requests_mock.Mocker()
     def test_get_config_success(self, m):
         """Test successful config retrieval"""
         expected_config = {
@@ -173,7 +184,6 @@ class TestAnomalyClient:
         result = self.client.get_config()
         assert result == expected_config
 
-    @requests_mock.Mocker()
     def test_network_error_handling(self, m):
         """Test network error handling"""
         m.get(f"{self.base_url}/health", exc=requests.exceptions.ConnectionError)
@@ -183,7 +193,6 @@ class TestAnomalyClient:
         
         assert "Network error" in str(exc_info.value)
 
-    @requests_mock.Mocker()
     def test_http_error_handling(self, m):
         """Test HTTP error handling"""
         m.get(f"{self.base_url}/health", status_code=404, text="Not found")
@@ -198,9 +207,11 @@ class TestAnomalyMiddleware:
     """Test cases for AnomalyMiddleware class"""
 
     def setup_method(self):
-        """Setup test middleware"""
+        """Setup test middleware (auto_flush off so tests control flushing)"""
         self.client = Mock(spec=AnomalyClient)
-        self.middleware = AnomalyMiddleware(self.client, "test-service")
+        self.middleware = AnomalyMiddleware(
+            self.client, "test-service", auto_flush=False
+        )
 
     def test_middleware_initialization(self):
         """Test middleware initialization"""
@@ -209,50 +220,67 @@ class TestAnomalyMiddleware:
 
     def test_track_request_success(self):
         """Test successful request tracking"""
-        self.client.send_metric.return_value = {"status": "success"}
+        self.client.send_batch.return_value = {"status": "success"}
 
         self.middleware.track_request("GET", "/api/users", 200, 150.5)
+        self.middleware.flush()
 
-        self.client.send_metric.assert_called_once()
-        call_args = self.client.send_metric.call_args[0][0]
-        assert call_args["service"] == "test-service"
-        assert call_args["endpoint"] == "GET:/api/users"
-        assert call_args["metrics"]["response_time"] == 150.5
-        assert call_args["metrics"]["status_code"] == 200
+        self.client.send_batch.assert_called_once()
+        items = self.client.send_batch.call_args[0][0]
+        assert len(items) == 1
+        assert items[0]["service"] == "test-service"
+        assert items[0]["endpoint"] == "GET:/api/users"
+        assert items[0]["metrics"]["response_time"] == 150.5
+        assert items[0]["metrics"]["status_code"] == 200
 
     def test_track_request_with_extra_metrics(self):
         """Test request tracking with extra metrics"""
-        self.client.send_metric.return_value = {"status": "success"}
+        self.client.send_batch.return_value = {"status": "success"}
         extra_metrics = {"payload_size": 1024, "user_id": "12345"}
 
         self.middleware.track_request("POST", "/api/orders", 201, 200.0, extra_metrics)
+        self.middleware.flush()
 
-        call_args = self.client.send_metric.call_args[0][0]
-        assert call_args["metrics"]["payload_size"] == 1024
-        assert call_args["metrics"]["user_id"] == "12345"
+        items = self.client.send_batch.call_args[0][0]
+        assert items[0]["metrics"]["payload_size"] == 1024
+        assert items[0]["metrics"]["user_id"] == "12345"
+
+    def test_track_request_batches_queued_metrics(self):
+        """Test multiple tracked requests flush as one batch"""
+        self.client.send_batch.return_value = {"status": "success"}
+
+        self.middleware.track_request("GET", "/api/users", 200, 100.0)
+        self.middleware.track_request("GET", "/api/orders", 200, 120.0)
+        self.middleware.flush()
+
+        self.client.send_batch.assert_called_once()
+        items = self.client.send_batch.call_args[0][0]
+        assert len(items) == 2
 
     def test_track_request_error_handling(self):
         """Test middleware error handling doesn't break application"""
-        self.client.send_metric.side_effect = AnomalyClientError("Network error")
+        self.client.send_batch.side_effect = AnomalyClientError("Network error")
 
         # Should not raise exception
         with patch('logging.warning') as mock_warning:
             self.middleware.track_request("GET", "/api/users", 500, 1000)
+            self.middleware.flush()
             mock_warning.assert_called_once()
 
 
 class TestRequestTimer:
     """Test cases for RequestTimer context manager"""
 
-    def setup_method(self):
-        """Setup test timer"""
-        self.client = Mock(spec=AnomalyClient)
+    @pytest.fixture(autouse=True)
+    def _setup(self, mock_client):
+        """Reuse the shared mock; reset wipes prior calls and side effects"""
+        mock_client.reset_mock(return_value=True, side_effect=True)
+        mock_client.send_metric.return_value = {"status": "success"}
+        self.client = mock_client
         self.timer = RequestTimer(self.client, "test-service", "GET:/api/test")
 
     def test_timer_success(self):
         """Test timer with successful execution"""
-        self.client.send_metric.return_value = {"status": "success"}
-
         with self.timer:
             # Simulate some work
             pass
@@ -266,8 +294,6 @@ class TestRequestTimer:
 
     def test_timer_with_exception(self):
         """Test timer when exception occurs"""
-        self.client.send_metric.return_value = {"status": "success"}
-
         try:
             with self.timer:
                 raise ValueError("Test error")
@@ -289,10 +315,12 @@ class TestRequestTimer:
 class TestTrackFunctionDecorator:
     """Test cases for track_function decorator"""
 
-    def setup_method(self):
-        """Setup test decorator"""
-        self.client = Mock(spec=AnomalyClient)
-        self.client.send_metric.return_value = {"status": "success"}
+    @pytest.fixture(autouse=True)
+    def _setup(self, mock_client):
+        """Reuse the shared mock; reset wipes prior calls and side effects"""
+        mock_client.reset_mock(return_value=True, side_effect=True)
+        mock_client.send_metric.return_value = {"status": "success"}
+        self.client = mock_client
 
     def test_decorator_success(self):
         """Test decorator with successful function"""
@@ -322,34 +350,36 @@ class TestTrackFunctionDecorator:
         assert call_args["metrics"]["status_code"] == 500
 
 
+# One client (and one keep-alive connection pool) for the whole integration
+# module; probing health once here also skips the module cleanly when the
+# collector isn't running instead of per-test try/skip.
+@pytest.fixture(scope="module")
+def live_client():
+    client = AnomalyClient("http://localhost:4000", timeout=5)
+    try:
+        client.health_check()
+    except AnomalyClientError:
+        pytest.skip("Data collector not running")
+    return client
+
+
 @pytest.mark.integration
 class TestIntegration:
     """Integration tests with actual HTTP server"""
 
-    def setup_method(self):
-        """Setup integration test"""
-        self.client = AnomalyClient("http://localhost:4000", timeout=5)
-
-    def test_integration_health_check(self):
+    def test_integration_health_check(self, live_client):
         """Test health check against running service"""
-        # This test requires the data collector to be running
-        try:
-            result = self.client.health_check()
-            assert "status" in result
-        except AnomalyClientError:
-            pytest.skip("Data collector not running")
+        result = live_client.health_check()
+        assert "status" in result
 
-    def test_integration_send_metric(self):
+    def test_integration_send_metric(self, live_client):
         """Test sending metric to running service"""
-        try:
-            result = self.client.send_metric({
-                "service": "test-integration",
-                "endpoint": "GET:/api/test",
-                "metrics": {"response_time": 100, "status_code": 200}
-            })
-            assert "status" in result or "success" in str(result).lower()
-        except AnomalyClientError:
-            pytest.skip("Data collector not running")
+        result = live_client.send_metric({
+            "service": "test-integration",
+            "endpoint": "GET:/api/test",
+            "metrics": {"response_time": 100, "status_code": 200}
+        })
+        assert "status" in result or "success" in str(result).lower()
 
 
 if __name__ == "__main__":
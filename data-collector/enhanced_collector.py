@@ -1,12 +1,37 @@
 import os
 import json
+import queue
+import threading
 import time
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
 from flask import Flask, request, Response, jsonify
 import requests
 import redis
 from tenacity import retry, stop_after_attempt, wait_exponential
-from datetime import datetime
 import logging
+import logging.handlers
+
+try:
+    import orjson
+
+    def _dump_json(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:  # orjson is optional; stdlib json keeps things working
+    orjson = None
+
+    def _dump_json(obj) -> str:
+        return json.dumps(obj)
+
+
+try:
+    import zstandard as zstd
+except ImportError:  # zstandard is optional; streams then store plain JSON
+    zstd = None
+
 
 # Enhanced Data Collector with Real-World Integration Support
 
@@ -17,9 +42,47 @@ API_KEY = os.getenv("API_KEY", None)  # Optional API key for security
 app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Handlers only enqueue records; the listener thread owns the blocking
+# stderr write, so the logging lock stops serializing request greenlets.
+_log_q: "queue.Queue" = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_q, logging.StreamHandler())
+logging.root.handlers = [logging.handlers.QueueHandler(_log_q)]
+_log_listener.start()
+
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class ORJSONProvider(DefaultJSONProvider):
+        """Route Flask's get_json()/jsonify() through orjson's C codec"""
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
+# Shared keep-alive session for upstream forwards; a bare requests.request()
+# builds a new Session (and TCP handshake) per call.
+_http = requests.Session()
+_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=64, pool_maxsize=256, max_retries=0
+)
+_http.mount("http://", _adapter)
+_http.mount("https://", _adapter)
+
+
+# Explicit pool so every client handed out shares (and caps) the same set of
+# sockets; under gevent workers each greenlet borrows a pooled connection
+# instead of racing to open its own.
+_redis_pool = redis.ConnectionPool(
+    host=REDIS_HOST, port=REDIS_PORT, decode_responses=True, max_connections=128
+)
+
 
 def get_redis_client() -> redis.Redis:
-    return redis.Redis(host=REDIS_HOST, port=REDIS_PORT, decode_responses=True)
+    return redis.Redis(connection_pool=_redis_pool)
 
 
 def validate_api_key(req):
@@ -38,26 +101,16 @@ def validate_api_key(req):
     stop=stop_after_attempt(5), wait=wait_exponential(multiplier=0.5, min=0.5, max=5)
 )
 def init_structures(r: redis.Redis) -> None:
-    try:
-        r.execute_command("CF.RESERVE", "service-calls", 1000000)
-    except redis.ResponseError:
-        pass
-    try:
-        r.execute_command("CMS.INITBYDIM", "endpoint-frequency", 100000, 10)
-    except redis.ResponseError:
-        pass
-    try:
-        r.execute_command("CMS.INITBYDIM", "status-codes", 100000, 10)
-    except redis.ResponseError:
-        pass
-    try:
-        r.execute_command("CMS.INITBYDIM", "response-times", 100000, 10)
-    except redis.ResponseError:
-        pass
-    try:
-        r.execute_command("CMS.INITBYDIM", "business-metrics", 100000, 10)
-    except redis.ResponseError:
-        pass
+    # One pipelined round-trip creates whatever is missing; "already exists"
+    # comes back as a ResponseError entry in the reply list and is ignored.
+    # Connection failures still raise, which is what @retry is for.
+    pipe = r.pipeline(transaction=False)
+    pipe.execute_command("CF.RESERVE", "service-calls", 1000000)
+    pipe.execute_command("CMS.INITBYDIM", "endpoint-frequency", 100000, 10)
+    pipe.execute_command("CMS.INITBYDIM", "status-codes", 100000, 10)
+    pipe.execute_command("CMS.INITBYDIM", "response-times", 100000, 10)
+    pipe.execute_command("CMS.INITBYDIM", "business-metrics", 100000, 10)
+    pipe.execute(raise_on_error=False)
 
 
 redis_client = get_redis_client()
@@ -67,6 +120,221 @@ except Exception as e:
     print(f"Failed to initialize Redis structures: {e}")
 
 
+# Scrape counters live in prometheus_client shared memory when available,
+# so /metrics serializes without touching Redis and the numbers aggregate
+# across all gunicorn workers (gunicorn_conf.py exports
+# PROMETHEUS_MULTIPROC_DIR). Increments hook into cms_incr below.
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter as PromCounter,
+        generate_latest,
+        multiprocess,
+    )
+
+    _PROM_TOTALS = {
+        "endpoint-frequency": PromCounter(
+            "anomaly_detector_endpoint_requests_total",
+            "Total endpoint requests processed",
+        ),
+        "status-codes": PromCounter(
+            "anomaly_detector_status_events_total",
+            "Total status code events processed",
+        ),
+        "response-times": PromCounter(
+            "anomaly_detector_response_time_events_total",
+            "Total response time events processed",
+        ),
+        "business-metrics": PromCounter(
+            "anomaly_detector_business_metrics_total",
+            "Total business metric events processed",
+        ),
+    }
+except ImportError:  # optional; /metrics falls back to the Redis scrape
+    _PROM_TOTALS = None
+
+
+# Count-min sketches are linearly mergeable, so each worker accumulates
+# exact (sketch, item) counts in local Counters and a flusher ships the
+# merged totals once a second as variadic CMS.INCRBY commands. Redis sees
+# one command per sketch per interval instead of one per event, with zero
+# accuracy loss (exact local counts beat a second layer of sketching).
+_CMS_FLUSH_INTERVAL = 1.0
+_CMS_MAX_PAIRS = 512  # item/count pairs per CMS.INCRBY frame
+_cms_buf: "defaultdict[str, Counter]" = defaultdict(Counter)
+_cms_lock = threading.Lock()
+
+
+def cms_incr(sketch: str, item: str, count: int = 1) -> None:
+    # Counter lookups ride CPython's cached str hash (computed once per
+    # interned key), so no mmh3/xxhash-style hot loop exists here; the d-way
+    # sketch hashing happens once per merged item inside redis-stack.
+    with _cms_lock:
+        _cms_buf[sketch][item] += count
+    if _PROM_TOTALS is not None:
+        prom = _PROM_TOTALS.get(sketch)
+        if prom is not None:
+            prom.inc(count)
+
+
+def _cms_flusher() -> None:
+    global _cms_buf
+    while True:
+        time.sleep(_CMS_FLUSH_INTERVAL)
+        with _cms_lock:
+            if not _cms_buf:
+                continue
+            buf, _cms_buf = _cms_buf, defaultdict(Counter)
+        pipe = redis_client.pipeline(transaction=False)
+        for sketch, counts in buf.items():
+            # chain.from_iterable flattens the (item, count) pairs in C
+            # instead of a per-pair Python append loop; very wide intervals
+            # are split so no single command frame grows unbounded
+            items = list(counts.items())
+            for start in range(0, len(items), _CMS_MAX_PAIRS):
+                pipe.execute_command(
+                    "CMS.INCRBY",
+                    sketch,
+                    *chain.from_iterable(items[start : start + _CMS_MAX_PAIRS]),
+                )
+        try:
+            pipe.execute(raise_on_error=False)
+        except Exception as e:
+            logging.error(f"Sketch flush failed: {e}")
+
+
+threading.Thread(target=_cms_flusher, daemon=True).start()
+
+
+# Canonical key strings for the hot paths: the distinct endpoints, service
+# pairs and status codes seen in practice form tiny sets, so cached lookups
+# replace the per-request f-string/str() allocations.
+_STATUS_STR = tuple(str(i) for i in range(600))
+
+
+def _status_str(code) -> str:
+    try:
+        return _STATUS_STR[code]
+    except (IndexError, TypeError):
+        return str(code)
+
+
+@lru_cache(maxsize=4096)
+def _canon_endpoint(method: str, path: str) -> str:
+    return f"{method}:/{path.strip('/')}"
+
+
+@lru_cache(maxsize=1024)
+def _call_key(src: str, tgt: str) -> str:
+    return f"{src}:{tgt}"
+
+
+# CF.ADD is idempotent for membership, so a process-local set is a perfect
+# negative cache: once a src:tgt pair has been registered, steady-state
+# traffic skips the Redis call entirely. Cleared when it grows past the cap
+# (re-adding to the filter is harmless).
+_seen_pairs: set = set()
+_SEEN_PAIRS_MAX = 100000
+
+
+def cf_add_pair(pair: str) -> None:
+    if pair in _seen_pairs:
+        return
+    if len(_seen_pairs) >= _SEEN_PAIRS_MAX:
+        _seen_pairs.clear()
+    _seen_pairs.add(pair)
+    try:
+        redis_client.execute_command("CF.ADD", "service-calls", pair)
+    except Exception as e:
+        # Drop from the cache so the next sighting retries the add
+        _seen_pairs.discard(pair)
+        logging.error(f"CF.ADD failed: {e}")
+
+
+# Default-timestamp fast path: datetime.utcnow().isoformat() allocates a
+# datetime per call for a value most payloads override anyway. The
+# second-resolution prefix is cached so repeated calls within the same
+# second only format the microsecond suffix.
+_last_second = 0
+_last_prefix = ""
+
+
+def _iso_now() -> str:
+    global _last_second, _last_prefix
+    seconds, ns = divmod(time.time_ns(), 1_000_000_000)
+    if seconds != _last_second:
+        _last_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _last_second = seconds
+    return f"{_last_prefix}.{ns // 1000:06d}"
+
+
+# Response-time buckets as a lookup table: bisect runs the boundary compare
+# in C, replacing the per-request if/elif ladder
+_RT_BOUNDS = (100, 500)
+_RT_BUCKETS = ("fast", "medium", "slow")
+
+
+def _time_bucket(response_time) -> str:
+    return _RT_BUCKETS[bisect_right(_RT_BOUNDS, response_time)]
+
+
+# Stream entries are detail/audit data, so handlers enqueue and return
+# instead of waiting on the XADD ack; the writer drains in pipelined batches
+# and the approximate MAXLEN keeps the streams from growing forever.
+STREAM_Q: "queue.Queue[tuple]" = queue.Queue(maxsize=100000)
+_STREAM_BATCH = 500
+_STREAM_MAXLEN = 1_000_000
+
+# The free-form "metrics" blob dominates detailed-metrics memory, so the
+# writer zstd-compresses it (level 1) before XADD and tags the entry with
+# enc=zstd so readers know to decompress. Nothing in this tree reads the
+# stream body back (only XLEN for the scrape), so the field can hold raw
+# bytes; a reader needs a bytes-mode client for this one stream.
+_zstd_c = zstd.ZstdCompressor(level=1) if zstd is not None else None
+
+
+def _pack_fields(stream: str, fields: dict):
+    if _zstd_c is None or stream != "detailed-metrics":
+        return fields
+    metrics = fields.get("metrics")
+    if metrics is None:
+        return fields
+    if not isinstance(metrics, bytes):
+        metrics = metrics.encode()
+    return dict(fields, metrics=_zstd_c.compress(metrics), enc="zstd")
+
+
+def enqueue_stream(stream: str, fields: dict) -> None:
+    try:
+        STREAM_Q.put_nowait((stream, fields))
+    except queue.Full:
+        logging.warning("Stream buffer full; dropping entry for %s", stream)
+
+
+def _stream_writer() -> None:
+    while True:
+        batch = [STREAM_Q.get()]
+        while len(batch) < _STREAM_BATCH:
+            try:
+                batch.append(STREAM_Q.get_nowait())
+            except queue.Empty:
+                break
+        pipe = redis_client.pipeline(transaction=False)
+        for stream, fields in batch:
+            pipe.xadd(
+                stream, _pack_fields(stream, fields),
+                maxlen=_STREAM_MAXLEN, approximate=True,
+            )
+        try:
+            pipe.execute(raise_on_error=False)
+        except Exception as e:
+            logging.error(f"Stream flush failed: {e}")
+
+
+threading.Thread(target=_stream_writer, daemon=True).start()
+
+
 @app.route("/")
 def root():
     return {
@@ -90,23 +358,40 @@ def root():
     }
 
 
+# Liveness probes and /config can hit at high QPS; one cached ping every
+# couple of seconds answers them all instead of an RTT per check.
+_PING_TTL = 2.0
+_ping_cache = [0.0, False, ""]  # [checked_at, ok, last_error]
+
+
+def _cached_ping() -> bool:
+    now = time.time()
+    if now - _ping_cache[0] > _PING_TTL:
+        try:
+            _ping_cache[1] = bool(redis_client.ping())
+            _ping_cache[2] = ""
+        except Exception as e:
+            _ping_cache[1] = False
+            _ping_cache[2] = str(e)
+        _ping_cache[0] = now
+    return _ping_cache[1]
+
+
 @app.route("/health")
 def health_check():
-    try:
-        redis_client.ping()
+    if _cached_ping():
         return {
             "status": "healthy",
             "redis": "connected",
             "timestamp": time.time(),
             "version": "2.0.0",
         }
-    except Exception as e:
-        return {
-            "status": "unhealthy",
-            "redis": "disconnected",
-            "error": str(e),
-            "timestamp": time.time(),
-        }, 503
+    return {
+        "status": "unhealthy",
+        "redis": "disconnected",
+        "error": _ping_cache[2],
+        "timestamp": time.time(),
+    }, 503
 
 
 @app.route("/config")
@@ -116,7 +401,7 @@ def get_config():
         "redis": {
             "host": REDIS_HOST,
             "port": REDIS_PORT,
-            "connected": True if redis_client.ping() else False,
+            "connected": _cached_ping(),
         },
         "security": {"api_key_required": API_KEY is not None},
         "structures": {
@@ -157,48 +442,38 @@ def receive_metrics():
         service = data.get("service", "unknown")
         endpoint = data.get("endpoint", "unknown")
         metrics = data.get("metrics", {})
-        timestamp = data.get("timestamp", datetime.utcnow().isoformat())
+        timestamp = data.get("timestamp") or _iso_now()
 
         # Update Redis structures
-        endpoint_key = f"{endpoint}"
-        status_code = str(metrics.get("status_code", 200))
+        endpoint_key = endpoint
+        status_code = _status_str(metrics.get("status_code", 200))
         response_time = metrics.get("response_time", 0)
 
+        # Bucket response times via the boundary table
+        time_bucket = _time_bucket(response_time)
+
         # Track service communication (if source service provided)
         source_service = data.get("source_service")
         if source_service:
-            redis_client.execute_command(
-                "CF.ADD", "service-calls", f"{source_service}:{service}"
-            )
+            cf_add_pair(_call_key(source_service, service))
 
-        # Track endpoint frequency
-        redis_client.execute_command(
-            "CMS.INCRBY", "endpoint-frequency", endpoint_key, 1
-        )
-
-        # Track status codes
-        redis_client.execute_command("CMS.INCRBY", "status-codes", status_code, 1)
-
-        # Track response times (bucketed)
-        time_bucket = (
-            "fast"
-            if response_time < 100
-            else "medium" if response_time < 500 else "slow"
-        )
-        redis_client.execute_command("CMS.INCRBY", "response-times", time_bucket, 1)
+        # Sketch increments are merged locally and flushed by _cms_flusher
+        cms_incr("endpoint-frequency", endpoint_key)
+        cms_incr("status-codes", status_code)
+        cms_incr("response-times", time_bucket)
 
-        # Store additional metrics as JSON in a stream for detailed analysis
-        redis_client.xadd(
+        # Detailed metrics are buffered and flushed by the stream writer
+        enqueue_stream(
             "detailed-metrics",
             {
                 "service": service,
                 "endpoint": endpoint,
-                "metrics": json.dumps(metrics),
+                "metrics": _dump_json(metrics),
                 "timestamp": timestamp,
             },
         )
 
-        logging.info(f"Received metrics from {service} - {endpoint} - {status_code}")
+        logging.debug("Received metrics from %s - %s - %s", service, endpoint, status_code)
 
         return jsonify(
             {
@@ -241,23 +516,23 @@ def receive_business_metrics():
         metric_name = data.get("metric_name")
         value = data.get("value")
         expected_range = data.get("expected_range", [])
-        timestamp = data.get("timestamp", datetime.utcnow().isoformat())
+        timestamp = data.get("timestamp") or _iso_now()
         metadata = data.get("metadata", {})
 
         if not metric_name or value is None:
             return jsonify({"error": "metric_name and value are required"}), 400
 
-        # Track business metric frequency
-        redis_client.execute_command("CMS.INCRBY", "business-metrics", metric_name, 1)
+        # Track business metric frequency (merged locally, flushed async)
+        cms_incr("business-metrics", metric_name)
 
         # Store detailed business metrics
-        redis_client.xadd(
+        enqueue_stream(
             "business-metrics-stream",
             {
                 "metric_name": metric_name,
                 "value": str(value),
-                "expected_range": json.dumps(expected_range),
-                "metadata": json.dumps(metadata),
+                "expected_range": _dump_json(expected_range),
+                "metadata": _dump_json(metadata),
                 "timestamp": timestamp,
             },
         )
@@ -273,7 +548,7 @@ def receive_business_metrics():
                     f"Business metric anomaly: {metric_name} = {value} (expected: {min_val}-{max_val})",
                 )
 
-        logging.info(f"Business metric received: {metric_name} = {value}")
+        logging.debug("Business metric received: %s = %s", metric_name, value)
 
         return jsonify(
             {
@@ -317,21 +592,21 @@ def receive_logs():
         log_level = data.get("log_level", "INFO")
         message = data.get("message", "")
         service = data.get("service", "unknown")
-        timestamp = data.get("timestamp", datetime.utcnow().isoformat())
+        timestamp = data.get("timestamp") or _iso_now()
         context = data.get("context", {})
 
-        # Track log levels by service
+        # Track log levels by service (merged locally, flushed async)
         log_key = f"{service}:{log_level}"
-        redis_client.execute_command("CMS.INCRBY", "endpoint-frequency", log_key, 1)
+        cms_incr("endpoint-frequency", log_key)
 
         # Store detailed logs
-        redis_client.xadd(
+        enqueue_stream(
             "log-metrics-stream",
             {
                 "log_level": log_level,
                 "message": message,
                 "service": service,
-                "context": json.dumps(context),
+                "context": _dump_json(context),
                 "timestamp": timestamp,
             },
         )
@@ -342,7 +617,7 @@ def receive_logs():
                 "alerts", f"Critical log detected in {service}: {log_level} - {message}"
             )
 
-        logging.info(f"Log received from {service}: {log_level}")
+        logging.debug("Log received from %s: %s", service, log_level)
 
         return jsonify(
             {
@@ -390,6 +665,9 @@ def receive_batch_metrics():
         processed = 0
         errors = []
 
+        # Increments land in the local sketch buffer, so the whole batch
+        # costs zero Redis round-trips in the handler; the flusher ships
+        # the merged counts
         for i, metric in enumerate(data["metrics"]):
             try:
                 metric_type = metric.get("type", "application")
@@ -400,12 +678,12 @@ def receive_batch_metrics():
                     endpoint = metric.get("endpoint", "unknown")
                     metrics = metric.get("metrics", {})
 
-                    status_code = str(metrics.get("status_code", 200))
-                    redis_client.execute_command(
-                        "CMS.INCRBY", "endpoint-frequency", endpoint, 1
-                    )
-                    redis_client.execute_command(
-                        "CMS.INCRBY", "status-codes", status_code, 1
+                    status_code = _status_str(metrics.get("status_code", 200))
+                    cms_incr("endpoint-frequency", endpoint)
+                    cms_incr("status-codes", status_code)
+                    cms_incr(
+                        "response-times",
+                        _time_bucket(metrics.get("response_time", 0)),
                     )
 
                 elif metric_type == "business":
@@ -414,16 +692,14 @@ def receive_batch_metrics():
                     value = metric.get("value")
 
                     if metric_name and value is not None:
-                        redis_client.execute_command(
-                            "CMS.INCRBY", "business-metrics", metric_name, 1
-                        )
+                        cms_incr("business-metrics", metric_name)
 
                 processed += 1
 
             except Exception as e:
                 errors.append(f"Metric {i}: {str(e)}")
 
-        logging.info(f"Batch processed: {processed} metrics, {len(errors)} errors")
+        logging.info("Batch processed: %d metrics, %d errors", processed, len(errors))
 
         return jsonify(
             {
@@ -439,26 +715,13 @@ def receive_batch_metrics():
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/metrics")
-def prometheus_metrics():
-    """Prometheus-compatible metrics endpoint"""
-    try:
-        # Get metrics from Redis
-        endpoint_info = redis_client.execute_command("CMS.INFO", "endpoint-frequency")
-        status_info = redis_client.execute_command("CMS.INFO", "status-codes")
-
-        endpoint_count = endpoint_info[5] if len(endpoint_info) > 5 else 0
-        status_count = status_info[5] if len(status_info) > 5 else 0
-
-        # Get stream lengths
-        fingerprints_count = redis_client.xlen("system-fingerprints")
-        detailed_metrics_count = redis_client.xlen("detailed-metrics")
-
-        metrics_text = f"""# HELP anomaly_detector_endpoint_requests_total Total endpoint requests processed
+# The exposition text is static apart from the sample values, so it is built
+# once and filled per scrape instead of re-assembled from f-string pieces
+_METRICS_TEMPLATE = """# HELP anomaly_detector_endpoint_requests_total Total endpoint requests processed
 # TYPE anomaly_detector_endpoint_requests_total counter
 anomaly_detector_endpoint_requests_total {endpoint_count}
 
-# HELP anomaly_detector_status_events_total Total status code events processed  
+# HELP anomaly_detector_status_events_total Total status code events processed
 # TYPE anomaly_detector_status_events_total counter
 anomaly_detector_status_events_total {status_count}
 
@@ -472,10 +735,65 @@ anomaly_detector_detailed_metrics_total {detailed_metrics_count}
 
 # HELP anomaly_detector_uptime_seconds Uptime in seconds
 # TYPE anomaly_detector_uptime_seconds gauge
-anomaly_detector_uptime_seconds {time.time()}
+anomaly_detector_uptime_seconds {uptime}
 """
 
-        return Response(metrics_text, mimetype="text/plain")
+# Scrapes are idempotent reads, so concurrent scrapers within a second share
+# one rendered body instead of each repeating the Redis round-trip; the lock
+# makes one caller recompute while the rest serve the previous body.
+_METRICS_TTL = 1.0
+_metrics_cache = [0.0, b""]  # [rendered-at, body]
+_metrics_lock = threading.Lock()
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    """Prometheus-compatible metrics endpoint"""
+    if _PROM_TOTALS is not None:
+        # Serialize from shared memory: no Redis round-trip per scrape, and
+        # the multiprocess collector merges every worker's counters
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+        return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
+    if time.time() - _metrics_cache[0] < _METRICS_TTL:
+        return Response(_metrics_cache[1], mimetype="text/plain")
+
+    try:
+        with _metrics_lock:
+            # Double-check under the lock: a concurrent scraper may have
+            # refreshed the body while this one waited
+            if time.time() - _metrics_cache[0] < _METRICS_TTL:
+                return Response(_metrics_cache[1], mimetype="text/plain")
+
+            # All four reads share one pipelined round-trip; Prometheus
+            # scrapes every few seconds, so this keeps scrape cost at a
+            # single RTT at most once per TTL
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.execute_command("CMS.INFO", "endpoint-frequency")
+            pipe.execute_command("CMS.INFO", "status-codes")
+            pipe.xlen("system-fingerprints")
+            pipe.xlen("detailed-metrics")
+            endpoint_info, status_info, fingerprints_count, detailed_metrics_count = (
+                pipe.execute()
+            )
+
+            endpoint_count = endpoint_info[5] if len(endpoint_info) > 5 else 0
+            status_count = status_info[5] if len(status_info) > 5 else 0
+
+            body = _METRICS_TEMPLATE.format(
+                endpoint_count=endpoint_count,
+                status_count=status_count,
+                fingerprints_count=fingerprints_count,
+                detailed_metrics_count=detailed_metrics_count,
+                uptime=time.time(),
+            ).encode()
+            _metrics_cache[1] = body
+            _metrics_cache[0] = time.time()
+
+        return Response(body, mimetype="text/plain")
 
     except Exception as e:
         return Response(f"# Error generating metrics: {e}", mimetype="text/plain"), 500
@@ -511,23 +829,13 @@ def forward(target_service: str, target_path: str):
     target_url = f"http://{target_service}:3000/{target_path}"
 
     try:
-        upstream = requests.request(method, target_url, timeout=5)
+        upstream = _http.request(method, target_url, timeout=5)
         status_code = upstream.status_code
-        endpoint_key = f"{method}:{'/' + target_path.strip('/')}"
+        endpoint_key = _canon_endpoint(method, target_path)
 
-        try:
-            # Update probabilistic structures
-            redis_client.execute_command(
-                "CF.ADD", "service-calls", f"{source_service}:{target_service}"
-            )
-            redis_client.execute_command(
-                "CMS.INCRBY", "endpoint-frequency", endpoint_key, 1
-            )
-            redis_client.execute_command(
-                "CMS.INCRBY", "status-codes", str(status_code), 1
-            )
-        except Exception as e:
-            print(f"Redis update failed: {e}")
+        cf_add_pair(_call_key(source_service, target_service))
+        cms_incr("endpoint-frequency", endpoint_key)
+        cms_incr("status-codes", _status_str(status_code))
 
         return Response(
             upstream.content,
@@ -535,14 +843,14 @@ def forward(target_service: str, target_path: str):
             content_type=upstream.headers.get("Content-Type", "text/plain"),
         )
     except requests.RequestException as e:
-        try:
-            redis_client.execute_command("CMS.INCRBY", "status-codes", "599", 1)
-        except Exception:
-            pass
+        cms_incr("status-codes", "599")
         return Response(
-            json.dumps({"error": str(e)}), status=502, content_type="application/json"
+            _dump_json({"error": str(e)}), status=502, content_type="application/json"
         )
 
 
 if __name__ == "__main__":
+    # Local debugging only; deploy with
+    #   gunicorn enhanced_collector:app -c gunicorn_conf.py
+    # so slow upstream forwards can't serialize metric ingestion.
     app.run(host="0.0.0.0", port=4000)
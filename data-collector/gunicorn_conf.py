@@ -0,0 +1,20 @@
+import os
+
+# Serves either collector under gunicorn, e.g.:
+#   gunicorn enhanced_collector:app -c gunicorn_conf.py
+# The gevent worker class monkey-patches the socket layer on boot, so the
+# blocking requests/redis-py calls in the handlers yield cooperatively and
+# each worker multiplexes up to worker_connections in-flight requests.
+# That is also why the collectors stay on Flask/WSGI rather than an ASGI
+# stack: the handlers are I/O-bound Redis/HTTP hops, and with the sketch and
+# stream writes buffered off the request path the framework's per-request
+# overhead is noise next to the remaining single round-trip.
+# prometheus_client aggregates counters across workers through this dir
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+bind = "0.0.0.0:4000"
+worker_class = "gevent"
+workers = max(2, os.cpu_count() or 2)
+worker_connections = 1000
+keepalive = 5
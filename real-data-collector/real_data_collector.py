@@ -6,17 +6,38 @@ Replaces mock data with real production data sources
 
 import os
 import yaml
+
+try:  # libyaml's C parser when the wheel ships it; pure Python otherwise
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 import asyncio
 import aiohttp
-import redis
+import redis.asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 import json
 import time
+from collections import Counter as TallyCounter, defaultdict
 from dataclasses import dataclass
+from itertools import chain
 from prometheus_client import Counter, Histogram, Gauge, start_http_server
 
+try:
+    import orjson
+
+    def _dump_json(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _load_json = orjson.loads
+except ImportError:  # orjson is optional; stdlib json keeps things working
+
+    def _dump_json(obj) -> str:
+        return json.dumps(obj)
+
+    _load_json = json.loads
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,27 +54,102 @@ DATA_SOURCE_ERRORS = Counter(
 )
 REDIS_OPERATIONS = Counter("redis_operations_total", "Total Redis operations")
 
-
-@dataclass
+# datetime.utcnow().isoformat() shows up in profiles on hot collection
+# cycles; strftime runs at most once per second here, with only the
+# microsecond suffix formatted per call
+_last_second = 0
+_last_prefix = ""
+
+
+def _iso_now() -> str:
+    global _last_second, _last_prefix
+    seconds, ns = divmod(time.time_ns(), 1_000_000_000)
+    if seconds != _last_second:
+        _last_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _last_second = seconds
+    return f"{_last_prefix}.{ns // 1000:06d}"
+
+
+# Same idea for the dashboard snapshot key, which only changes per minute
+_last_minute = 0
+_last_minute_key = ""
+
+
+def _minute_key() -> str:
+    global _last_minute, _last_minute_key
+    minute = int(time.time()) // 60
+    if minute != _last_minute:
+        _last_minute_key = time.strftime("%Y%m%d%H%M", time.gmtime(minute * 60))
+        _last_minute = minute
+    return _last_minute_key
+
+
+# The metric name is a pure function of the query string, so the
+# (query, name) pairs are derived once here instead of re-splitting
+# inside the per-query fetch loop every cycle
+DATADOG_QUERIES = [
+    (q, q.split(":", 1)[1].split("{", 1)[0])
+    for q in (
+        "avg:http.response_time{*}",
+        "sum:http.requests{status_code:5xx}",
+        "sum:http.requests{status_code:2xx}",
+        "avg:system.cpu.user{*}",
+        "avg:system.mem.used{*}",
+    )
+]
+
+PROMETHEUS_QUERIES = {
+    "request_rate": "rate(http_requests_total[5m])",
+    "response_time_p95": "histogram_quantile(0.95, rate(http_request_duration_seconds_bucket[5m]))",
+    "error_rate": 'rate(http_requests_total{status=~"5.."}[5m])',
+    "cpu_usage": '100 - (avg by (instance) (irate(node_cpu_seconds_total{mode="idle"}[5m])) * 100)',
+    "memory_usage": "100 - ((node_memory_MemAvailable_bytes / node_memory_MemTotal_bytes) * 100)",
+}
+
+
+@dataclass(slots=True)
 class DataSource:
     name: str
     type: str
     config: Dict[str, Any]
     enabled: bool = True
+    # Request headers resolved once at init; None means no auth configured
+    headers: Optional[Dict[str, str]] = None
+    # Compiled response-transform for custom-api sources; None means raw
+    extract: Optional[Callable[[Any], Any]] = None
+    # Collector coroutine bound at init; None means the type is unsupported
+    handler: Optional[Callable] = None
 
 
 class RealDataCollector:
     def __init__(self, config_path: str = "config/real_data_sources.yml"):
         self.config = self.load_config(config_path)
         self.redis_client = self.init_redis()
+        # Credentials don't change at runtime, so the env lookups and the
+        # header dict are resolved once instead of per collection call
+        api_key = os.getenv("DATADOG_API_KEY")
+        app_key = os.getenv("DATADOG_APP_KEY")
+        self._dd_headers = (
+            {
+                "Content-Type": "application/json",
+                "DD-API-KEY": api_key,
+                "DD-APPLICATION-KEY": app_key,
+            }
+            if api_key and app_key
+            else None
+        )
         self.data_sources = self.init_data_sources()
         self.session = None
+        # Fire-and-forget command buffer drained by _redis_writer; bounded
+        # so a Redis outage surfaces as dropped writes, not growing memory
+        self._write_q: asyncio.Queue = asyncio.Queue(maxsize=100000)
+        self._writer_task = None
 
     def load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         try:
             with open(config_path, "r") as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YamlLoader)
             logger.info(f"Loaded configuration from {config_path}")
             return config
         except FileNotFoundError:
@@ -84,17 +180,19 @@ class RealDataCollector:
             },
         }
 
-    def init_redis(self) -> redis.Redis:
-        """Initialize Redis connection"""
+    def init_redis(self) -> redis.asyncio.Redis:
+        """Build the async Redis client (connects lazily; see verify_redis)"""
+        return redis.asyncio.Redis(
+            host=os.getenv("REDIS_HOST", "redis-stack"),
+            port=int(os.getenv("REDIS_PORT", "6379")),
+            decode_responses=True,
+        )
+
+    async def verify_redis(self):
+        """Ping once at startup so a bad Redis config fails fast"""
         try:
-            client = redis.Redis(
-                host=os.getenv("REDIS_HOST", "redis-stack"),
-                port=int(os.getenv("REDIS_PORT", "6379")),
-                decode_responses=True,
-            )
-            client.ping()
+            await self.redis_client.ping()
             logger.info("Redis connection established")
-            return client
         except Exception as e:
             logger.error(f"Redis connection failed: {e}")
             raise
@@ -103,11 +201,20 @@ class RealDataCollector:
         """Initialize data sources from configuration"""
         sources = []
 
-        # APM Sources
+        # APM Sources (only the Datadog provider has a collector today)
         if self.config.get("data_sources", {}).get("apm", {}).get("enabled"):
             for provider in self.config["data_sources"]["apm"].get("providers", []):
                 sources.append(
-                    DataSource(name=provider["name"], type="apm", config=provider)
+                    DataSource(
+                        name=provider["name"],
+                        type="apm",
+                        config=provider,
+                        handler=(
+                            self.collect_datadog_metrics
+                            if provider["name"] == "datadog"
+                            else None
+                        ),
+                    )
                 )
 
         # Infrastructure Sources
@@ -117,7 +224,14 @@ class RealDataCollector:
             ):
                 sources.append(
                     DataSource(
-                        name=provider["name"], type="infrastructure", config=provider
+                        name=provider["name"],
+                        type="infrastructure",
+                        config=provider,
+                        handler=(
+                            self.collect_prometheus_metrics
+                            if provider["name"] == "prometheus"
+                            else None
+                        ),
                     )
                 )
 
@@ -128,17 +242,63 @@ class RealDataCollector:
             ):
                 sources.append(
                     DataSource(
-                        name=endpoint["name"], type="custom_api", config=endpoint
+                        name=endpoint["name"],
+                        type="custom_api",
+                        config=endpoint,
+                        headers=self._build_api_headers(endpoint),
+                        extract=self._compile_transform(endpoint.get("transform")),
+                        handler=self.collect_custom_api_metrics,
                     )
                 )
 
         logger.info(f"Initialized {len(sources)} data sources")
         return sources
 
+    @staticmethod
+    def _compile_transform(transform: Optional[str]) -> Callable[[Any], Any]:
+        """Compile a "jsonpath:$.field" transform into an extractor once.
+
+        The per-response startswith/split/if-elif interpretation collapses
+        to one precomputed dict lookup; transforms that aren't jsonpath
+        pass the payload through unchanged, as before.
+        """
+        if not (transform and transform.startswith("jsonpath:")):
+            return lambda data: data
+        # "$.count" and friends resolve to their final path segment, which
+        # is exactly what the old chained branches did case by case
+        key = transform.split(":", 1)[1].rsplit(".", 1)[-1]
+        return lambda data: data.get(key, 0) if isinstance(data, dict) else 0
+
+    @staticmethod
+    def _build_api_headers(endpoint: Dict[str, Any]) -> Dict[str, str]:
+        """Resolve a custom-api endpoint's auth headers once at init"""
+        headers = {"Content-Type": "application/json"}
+        auth_type = endpoint.get("auth_type")
+        auth_value = endpoint.get("auth_token") or endpoint.get("auth_value")
+        if auth_type == "bearer" and auth_value:
+            headers["Authorization"] = f"Bearer {auth_value}"
+        elif auth_type == "api_key" and auth_value:
+            headers[endpoint.get("auth_header", "X-API-Key")] = auth_value
+        return headers
+
     async def start_session(self):
         """Start aiohttp session for HTTP requests"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
+            # Explicit pool limits so the query fan-out doesn't stall on the
+            # connector cap, plus keepalive/DNS caching so connections and
+            # lookups survive across collection cycles; numbers are tunable
+            # via collection.http_pool in the config
+            pool = self.config.get("collection", {}).get("http_pool", {})
+            connector = aiohttp.TCPConnector(
+                limit=pool.get("limit", 200),
+                limit_per_host=pool.get("limit_per_host", 32),
+                keepalive_timeout=pool.get("keepalive_timeout", 75),
+                ttl_dns_cache=pool.get("ttl_dns_cache", 300),
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=pool.get("timeout", 30)),
+            )
 
     async def stop_session(self):
         """Stop aiohttp session"""
@@ -149,49 +309,35 @@ class RealDataCollector:
     async def collect_datadog_metrics(self, source: DataSource) -> Dict[str, Any]:
         """Collect metrics from Datadog"""
         try:
-            api_key = os.getenv("DATADOG_API_KEY")
-            app_key = os.getenv("DATADOG_APP_KEY")
-
-            if not api_key or not app_key:
+            headers = self._dd_headers
+            if headers is None:
                 logger.warning("Datadog API credentials not configured")
                 return {}
 
-            headers = {
-                "Content-Type": "application/json",
-                "DD-API-KEY": api_key,
-                "DD-APPLICATION-KEY": app_key,
-            }
-
             # Get metrics from last hour
             end_time = int(time.time())
             start_time = end_time - 3600
 
-            # Example queries for common metrics
-            queries = [
-                "avg:http.response_time{*}",
-                "sum:http.requests{status_code:5xx}",
-                "sum:http.requests{status_code:2xx}",
-                "avg:system.cpu.user{*}",
-                "avg:system.mem.used{*}",
-            ]
-
-            metrics = {}
-            for query in queries:
+            # Each query is an independent GET, so fetch them concurrently;
+            # the compound latency collapses to the slowest single query
+            async def fetch(query, metric_name):
                 params = {"query": query, "from": start_time, "to": end_time}
-
                 async with self.session.get(
                     "https://api.datadoghq.com/api/v1/query",
                     headers=headers,
                     params=params,
                 ) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = _load_json(await response.read())
                         if data.get("series"):
                             # Extract the metric value
-                            metric_name = query.split(":")[1].split("{")[0]
-                            metrics[metric_name] = data["series"][0]["pointlist"][-1][1]
+                            return metric_name, data["series"][0]["pointlist"][-1][1]
+                return None
 
-            return metrics
+            results = await asyncio.gather(
+                *(fetch(q, n) for q, n in DATADOG_QUERIES)
+            )
+            return dict(r for r in results if r is not None)
 
         except Exception as e:
             logger.error(f"Error collecting Datadog metrics: {e}")
@@ -206,31 +352,25 @@ class RealDataCollector:
                 logger.warning(f"No endpoint configured for {source.name}")
                 return {}
 
-            # Common Prometheus queries
-            queries = {
-                "request_rate": "rate(http_requests_total[5m])",
-                "response_time_p95": "histogram_quantile(0.95, rate(http_request_duration_seconds_bucket[5m]))",
-                "error_rate": 'rate(http_requests_total{status=~"5.."}[5m])',
-                "cpu_usage": '100 - (avg by (instance) (irate(node_cpu_seconds_total{mode="idle"}[5m])) * 100)',
-                "memory_usage": "100 - ((node_memory_MemAvailable_bytes / node_memory_MemTotal_bytes) * 100)",
-            }
-
-            metrics = {}
-            for metric_name, query in queries.items():
-                params = {"query": query}
-
+            # Same fan-out as the Datadog collector: independent GETs, one
+            # gather, latency of the slowest query instead of the sum
+            async def fetch(metric_name, query):
                 async with self.session.get(
-                    f"{endpoint}/api/v1/query", params=params
+                    f"{endpoint}/api/v1/query", params={"query": query}
                 ) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        data = _load_json(await response.read())
                         if data.get("data", {}).get("result"):
                             # Extract the metric value
                             result = data["data"]["result"][0]
                             if "value" in result:
-                                metrics[metric_name] = float(result["value"][1])
+                                return metric_name, float(result["value"][1])
+                return None
 
-            return metrics
+            results = await asyncio.gather(
+                *(fetch(n, q) for n, q in PROMETHEUS_QUERIES.items())
+            )
+            return dict(r for r in results if r is not None)
 
         except Exception as e:
             logger.error(f"Error collecting Prometheus metrics: {e}")
@@ -241,37 +381,18 @@ class RealDataCollector:
         """Collect metrics from custom API endpoints"""
         try:
             url = source.config.get("url")
-            auth_type = source.config.get("auth_type")
-            auth_value = source.config.get("auth_token") or source.config.get(
-                "auth_value"
-            )
-
-            headers = {"Content-Type": "application/json"}
-            if auth_type == "bearer" and auth_value:
-                headers["Authorization"] = f"Bearer {auth_value}"
-            elif auth_type == "api_key" and auth_value:
-                header_name = source.config.get("auth_header", "X-API-Key")
-                headers[header_name] = auth_value
+            headers = source.headers or self._build_api_headers(source.config)
 
             async with self.session.get(url, headers=headers) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _load_json(await response.read())
 
-                    # Extract metrics based on configuration
+                    # Extract metrics with the transform compiled at init
                     metric_name = source.config.get("metric_name", "custom_metric")
-                    transform = source.config.get("transform")
-
-                    if transform and transform.startswith("jsonpath:"):
-                        # Simple JSON path extraction (you might want to use jsonpath-ng for complex paths)
-                        path = transform.split(":", 1)[1]
-                        if path == "$.count":
-                            return {metric_name: data.get("count", 0)}
-                        elif path == "$.success_rate":
-                            return {metric_name: data.get("success_rate", 0)}
-                        else:
-                            return {metric_name: data.get(path.split(".")[-1], 0)}
-                    else:
-                        return {metric_name: data}
+                    extract = source.extract or self._compile_transform(
+                        source.config.get("transform")
+                    )
+                    return {metric_name: extract(data)}
                 else:
                     logger.warning(
                         f"Custom API {source.name} returned status {response.status}"
@@ -288,22 +409,18 @@ class RealDataCollector:
         start_time = time.time()
 
         try:
-            if source.type == "apm" and source.name == "datadog":
-                metrics = await self.collect_datadog_metrics(source)
-            elif source.type == "infrastructure" and source.name == "prometheus":
-                metrics = await self.collect_prometheus_metrics(source)
-            elif source.type == "custom_api":
-                metrics = await self.collect_custom_api_metrics(source)
-            else:
+            # Handler resolved once at init; no per-call string dispatch
+            if source.handler is None:
                 logger.warning(
                     f"Unsupported data source type: {source.type} for {source.name}"
                 )
                 return {}
+            metrics = await source.handler(source)
 
             # Add metadata
             metrics["_source"] = source.name
             metrics["_type"] = source.type
-            metrics["_timestamp"] = datetime.utcnow().isoformat()
+            metrics["_timestamp"] = _iso_now()
 
             duration = time.time() - start_time
             COLLECTION_DURATION.observe(duration)
@@ -316,83 +433,158 @@ class RealDataCollector:
             DATA_SOURCE_ERRORS.inc()
             return {}
 
-    def store_metrics_in_redis(self, metrics: Dict[str, Any]):
-        """Store collected metrics in Redis data structures"""
-        try:
-            timestamp = datetime.utcnow()
-
-            # Store in Redis Stream for time-series analysis
-            stream_data = {
-                "data": json.dumps(metrics),
-                "timestamp": timestamp.isoformat(),
-                "source": metrics.get("_source", "unknown"),
-            }
+    _WRITE_BATCH = 500
 
-            self.redis_client.xadd("real-system-fingerprints", stream_data)
-            REDIS_OPERATIONS.inc()
+    def _enqueue_write(self, *args):
+        """Fire-and-forget a Redis command; the writer task ships it"""
+        try:
+            self._write_q.put_nowait(args)
+        except asyncio.QueueFull:
+            logger.warning("Redis write buffer full; dropping %s", args[0])
 
-            # Update Count-Min Sketch for endpoint frequency (if applicable)
-            if "endpoint" in metrics:
-                self.redis_client.execute_command(
-                    "CMS.INCRBY", "endpoint-frequency", metrics["endpoint"], 1
+    async def _redis_writer(self):
+        """Drain queued fingerprint/sketch writes in pipelined batches"""
+        while True:
+            batch = [await self._write_q.get()]
+            while len(batch) < self._WRITE_BATCH:
+                try:
+                    batch.append(self._write_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            # CMS.INCRBY is variadic, so the drained increments collapse to
+            # one command per sketch per flush instead of one per metric
+            sketch_counts = defaultdict(TallyCounter)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for args in batch:
+                if args[0] == "CMS.INCRBY" and len(args) == 4:
+                    sketch_counts[args[1]][args[2]] += int(args[3])
+                else:
+                    pipe.execute_command(*args)
+            for sketch, counts in sketch_counts.items():
+                pipe.execute_command(
+                    "CMS.INCRBY",
+                    sketch,
+                    *chain.from_iterable(counts.items()),
                 )
-                REDIS_OPERATIONS.inc()
+            try:
+                queued = len(pipe)
+                await pipe.execute(raise_on_error=False)
+                REDIS_OPERATIONS.inc(queued)
+            except Exception as e:
+                logger.error(f"Background Redis flush failed: {e}")
+
+    def _queue_metrics(self, pipe, metrics: Dict[str, Any]):
+        """Queue one source's writes; only the dashboard snapshot waits"""
+
+        # The fingerprint stream entry and sketch bumps are monitoring
+        # side-effects, so they go through the fire-and-forget queue and
+        # never gate the collection path on a Redis ack. Each metric is its
+        # own stream field rather than one JSON blob: Redis stores the map
+        # natively, encoding is a str() per value, and readers can pick
+        # individual fields without re-parsing a document.
+        entry = {
+            "timestamp": _iso_now(),
+            "source": metrics.get("_source", "unknown"),
+        }
+        entry.update((k, str(v)) for k, v in metrics.items())
+        self._enqueue_write(
+            "XADD",
+            "real-system-fingerprints",
+            "*",
+            *chain.from_iterable(entry.items()),
+        )
+
+        # Update Count-Min Sketch for endpoint frequency (if applicable)
+        if "endpoint" in metrics:
+            self._enqueue_write(
+                "CMS.INCRBY", "endpoint-frequency", metrics["endpoint"], 1
+            )
 
-            # Update status codes (if applicable)
-            if "status_code" in metrics:
-                self.redis_client.execute_command(
-                    "CMS.INCRBY", "status-codes", str(metrics["status_code"]), 1
-                )
-                REDIS_OPERATIONS.inc()
+        # Update status codes (if applicable)
+        if "status_code" in metrics:
+            self._enqueue_write(
+                "CMS.INCRBY", "status-codes", str(metrics["status_code"]), 1
+            )
 
-            # Store raw metrics for dashboard
-            metric_key = f"metrics:{metrics.get('_source', 'unknown')}:{timestamp.strftime('%Y%m%d%H%M')}"
-            self.redis_client.setex(metric_key, 3600, json.dumps(metrics))  # 1 hour TTL
-            REDIS_OPERATIONS.inc()
+        # The dashboard snapshot stays on the acknowledged pipeline so a
+        # cycle doesn't report success while the key it reads is missing
+        metric_key = f"metrics:{metrics.get('_source', 'unknown')}:{_minute_key()}"
+        pipe.setex(metric_key, 3600, _dump_json(metrics))  # 1 hour TTL
 
-            logger.debug(f"Stored metrics from {metrics.get('_source', 'unknown')}")
+        logger.debug(f"Queued metrics from {metrics.get('_source', 'unknown')}")
 
+    async def _flush_pipe(self, pipe):
+        """Execute queued writes; pipelines reset themselves after execute"""
+        queued = len(pipe)
+        if not queued:
+            return
+        try:
+            await pipe.execute()
+            REDIS_OPERATIONS.inc(queued)
         except Exception as e:
             logger.error(f"Error storing metrics in Redis: {e}")
 
-    async def collect_all_sources(self):
-        """Collect data from all enabled sources"""
-        await self.start_session()
+    async def store_metrics_in_redis(self, metrics: Dict[str, Any]):
+        """Store one source's metrics immediately (single round-trip)"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._queue_metrics(pipe, metrics)
+        await self._flush_pipe(pipe)
 
+    @staticmethod
+    def _parse_interval(spec, default: int = 60) -> int:
+        """Turn a config interval like "30s"/"1m"/"5m" into seconds"""
         try:
-            for source in self.data_sources:
-                if source.enabled:
-                    logger.info(f"Collecting from {source.name} ({source.type})")
-                    metrics = await self.collect_from_source(source)
-
-                    if metrics:
-                        self.store_metrics_in_redis(metrics)
-                        logger.info(
-                            f"Collected {len(metrics)} metrics from {source.name}"
-                        )
-                    else:
-                        logger.warning(f"No metrics collected from {source.name}")
-
-        finally:
-            await self.stop_session()
+            if isinstance(spec, (int, float)):
+                return int(spec)
+            unit = {"s": 1, "m": 60, "h": 3600}.get(spec[-1])
+            if unit:
+                return int(spec[:-1]) * unit
+            return int(spec)
+        except (TypeError, ValueError, IndexError):
+            return default
+
+    async def _source_loop(self, source: DataSource, interval: int):
+        """Collect one source forever at its own cadence"""
+        logger.info(f"Scheduling {source.name} ({source.type}) every {interval}s")
+        while True:
+            try:
+                metrics = await self.collect_from_source(source)
+                if metrics:
+                    await self.store_metrics_in_redis(metrics)
+                    logger.info(f"Collected {len(metrics)} metrics from {source.name}")
+                else:
+                    logger.warning(f"No metrics collected from {source.name}")
+            except Exception as e:
+                logger.error(f"Error in {source.name} loop: {e}")
+            await asyncio.sleep(interval)
 
     async def run_collection_loop(self):
-        """Main collection loop"""
+        """Run every enabled source on its configured interval"""
         logger.info("Starting real data collection loop")
+        await self.start_session()
 
-        while True:
-            try:
-                await self.collect_all_sources()
-
-                # Wait for next collection cycle
-                await asyncio.sleep(60)  # Collect every minute
+        # A fixed 60s outer cycle collected every source at the slowest
+        # cadence; per-source tasks honor collection.intervals instead
+        # (apm 30s, infrastructure 1m, ... per the config), so a fast
+        # source isn't starved by a slow one sharing its cycle
+        intervals = self.config.get("collection", {}).get("intervals", {})
+        loops = [
+            asyncio.create_task(
+                self._source_loop(s, self._parse_interval(intervals.get(s.type)))
+            )
+            for s in self.data_sources
+            if s.enabled
+        ]
+        if not loops:
+            logger.warning("No data sources enabled; nothing to collect")
+            return
 
-            except KeyboardInterrupt:
-                logger.info("Collection loop interrupted")
-                break
-            except Exception as e:
-                logger.error(f"Error in collection loop: {e}")
-                await asyncio.sleep(30)  # Wait before retrying
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            for task in loops:
+                task.cancel()
+            await self.stop_session()
 
 
 async def main():
@@ -401,12 +593,24 @@ async def main():
     start_http_server(8000)
 
     collector = RealDataCollector()
+    await collector.verify_redis()
+    collector._writer_task = asyncio.create_task(collector._redis_writer())
 
     try:
         await collector.run_collection_loop()
     finally:
+        collector._writer_task.cancel()
         await collector.stop_session()
 
 
 if __name__ == "__main__":
+    try:
+        # libuv-backed event loop; worthwhile here since the collector is
+        # all concurrent aiohttp + async-redis I/O. Optional (no Windows
+        # wheels), so the default loop remains the fallback.
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
@@ -4,6 +4,16 @@ from redisgears import executeCommand as redis_cmd
 from redisgears import log as log
 from typing import List
 
+try:  # numpy is present only if the Gears runtime installed it
+    import numpy as np
+except ImportError:
+    np = None
+
+try:  # orjson is likewise optional inside the embedded interpreter
+    import orjson
+except ImportError:
+    orjson = None
+
 IMPORTANT_ENDPOINTS = [
     "GET:/api/data",
     "GET:/api/error",
@@ -18,7 +28,45 @@ def read_count_min_sketch(key: str, items: List[str]) -> List[int]:
     return [int(x) for x in res]
 
 
+# Both sketches read in one EVAL: executeCommand is in-process (no network
+# round-trip to save), but a single dispatch still halves the command
+# overhead per tick versus two separate CMS.QUERY calls. ARGV carries the
+# endpoint-item count so the caller can split the concatenated reply.
+READ_SKETCHES_LUA = """
+local n = tonumber(ARGV[1])
+local e = redis.call('CMS.QUERY', KEYS[1], unpack(ARGV, 2, n + 1))
+local s = redis.call('CMS.QUERY', KEYS[2], unpack(ARGV, n + 2, #ARGV))
+for i = 1, #s do e[#e + 1] = s[i] end
+return e
+"""
+
+
+def read_both_sketches() -> (List[int], List[int]):
+    res = redis_cmd(
+        "EVAL",
+        READ_SKETCHES_LUA,
+        "2",
+        "endpoint-frequency",
+        "status-codes",
+        str(len(IMPORTANT_ENDPOINTS)),
+        *IMPORTANT_ENDPOINTS,
+        *STATUS_CODES,
+    )
+    counts = [int(x) for x in res]
+    split = len(IMPORTANT_ENDPOINTS)
+    return counts[:split], counts[split:]
+
+
 def normalize(values: List[int]) -> List[float]:
+    # One C-level divide over the whole vector when numpy is available;
+    # the Python comprehension stays as the fallback for the small default
+    # bucket lists, where either path is cheap
+    if np is not None:
+        a = np.asarray(values, dtype=np.float64)
+        total = a.sum()
+        if total == 0.0:
+            return [0.0] * len(values)
+        return (a / total).tolist()
     total = float(sum(values))
     if total == 0.0:
         return [0.0 for _ in values]
@@ -27,36 +75,118 @@ def normalize(values: List[int]) -> List[float]:
 
 def build_fingerprint() -> List[float]:
     try:
-        endpoint_counts = read_count_min_sketch(
-            "endpoint-frequency", IMPORTANT_ENDPOINTS
-        )
-    except Exception as e:
-        log(f"CMS read failed (endpoint-frequency): {e}")
-        endpoint_counts = [0 for _ in IMPORTANT_ENDPOINTS]
-    try:
-        status_counts = read_count_min_sketch("status-codes", STATUS_CODES)
+        endpoint_counts, status_counts = read_both_sketches()
     except Exception as e:
-        log(f"CMS read failed (status-codes): {e}")
-        status_counts = [0 for _ in STATUS_CODES]
+        # Fall back to per-sketch reads, e.g. if scripting is unavailable
+        log(f"Combined CMS read failed: {e}")
+        try:
+            endpoint_counts = read_count_min_sketch(
+                "endpoint-frequency", IMPORTANT_ENDPOINTS
+            )
+        except Exception as e:
+            log(f"CMS read failed (endpoint-frequency): {e}")
+            endpoint_counts = [0 for _ in IMPORTANT_ENDPOINTS]
+        try:
+            status_counts = read_count_min_sketch("status-codes", STATUS_CODES)
+        except Exception as e:
+            log(f"CMS read failed (status-codes): {e}")
+            status_counts = [0 for _ in STATUS_CODES]
 
     features = normalize(endpoint_counts) + normalize(status_counts)
     return features
 
 
 def write_to_stream(vec: List[float]) -> None:
-    data = "[" + ",".join([str(round(x, 6)) for x in vec]) + "]"
+    if orjson is not None:
+        # One C-level encode instead of a str() + join per element
+        data = orjson.dumps([round(x, 6) for x in vec]).decode()
+    else:
+        data = "[" + ",".join([str(round(x, 6)) for x in vec]) + "]"
     try:
         redis_cmd("XADD", "system-fingerprints", "*", "data", data)
     except Exception as e:
         log(f"XADD failed: {e}")
 
 
+# The whole tick fused into one script: query both sketches, normalize,
+# and XADD the fingerprint in a single dispatch with no intermediate
+# Python lists. Floats are formatted with %.6f, matching the round(x, 6)
+# precision of the Python path and staying valid JSON for the dashboard.
+AGGREGATE_TICK_LUA = """
+local n = tonumber(ARGV[1])
+local e = redis.call('CMS.QUERY', KEYS[1], unpack(ARGV, 2, n + 1))
+local s = redis.call('CMS.QUERY', KEYS[2], unpack(ARGV, n + 2, #ARGV))
+local out = {}
+local function norm(t)
+    local total = 0
+    for i = 1, #t do total = total + t[i] end
+    for i = 1, #t do
+        if total == 0 then
+            out[#out + 1] = '0.0'
+        else
+            out[#out + 1] = string.format('%.6f', t[i] / total)
+        end
+    end
+end
+norm(e)
+norm(s)
+redis.call('XADD', KEYS[3], '*', 'data', '[' .. table.concat(out, ',') .. ']')
+return #out
+"""
+
+
 def aggregate_tick():
-    vec = build_fingerprint()
-    write_to_stream(vec)
+    try:
+        redis_cmd(
+            "EVAL",
+            AGGREGATE_TICK_LUA,
+            "3",
+            "endpoint-frequency",
+            "status-codes",
+            "system-fingerprints",
+            str(len(IMPORTANT_ENDPOINTS)),
+            *IMPORTANT_ENDPOINTS,
+            *STATUS_CODES,
+        )
+    except Exception as e:
+        # Scripting unavailable: fall back to the Python build/write path
+        log(f"Fused aggregation failed: {e}")
+        vec = build_fingerprint()
+        write_to_stream(vec)
     log("Aggregation completed")
 
 
+def register_stream_trigger() -> bool:
+    """Re-aggregate when the collector actually ingests data.
+
+    A StreamReader registration on real-system-fingerprints replaces any
+    timed scheduling: quiet periods cost nothing, and bursts are amortized
+    because each triggered execution covers a whole batch of entries.
+    """
+    try:
+        builder = GearsBuilder("StreamReader")
+    except NameError:
+        # Older Gears runtime without the builder builtin
+        log("GearsBuilder unavailable; aggregation stays one-shot")
+        return False
+    try:
+        # Collapse each batch to one record so the tick runs once per
+        # batch of ingested entries, not once per entry
+        builder.aggregate(0, lambda acc, r: acc + 1, lambda a, b: a + b)
+        builder.foreach(lambda n: aggregate_tick())
+        builder.register(
+            regex="real-system-fingerprints",
+            batch=100,
+            duration=5000,
+            mode="async_local",
+        )
+        log("Registered stream-triggered aggregation")
+        return True
+    except Exception as e:
+        log(f"Stream trigger registration failed: {e}")
+        return False
+
+
 def main():
     # Initialize sketches if they don't exist
     try:
@@ -66,7 +196,10 @@ def main():
     except Exception as e:
         log(f"Failed to initialize sketches: {e}")
 
-    # Run one aggregation cycle
+    register_stream_trigger()
+
+    # Run one aggregation cycle so a fingerprint exists before the first
+    # stream entry arrives
     aggregate_tick()
     log("Script execution completed")
 